@@ -0,0 +1,215 @@
+"""
+✍️ 著者グラフ
+読書ノートから 著者–テーマ/カテゴリ の2部グラフと 著者–著者 グラフを作り、
+連結成分とラベル伝播によるコミュニティ（著者クラスター）を求める。
+
+- グラフはCSR形式（indptr / indices / weights の配列）で持つ
+- 著者ごとに上位 TOP_FEATURES 個の特徴（テーマ・カテゴリ）だけを辺にするので疎
+- 著者–著者の辺は、特徴ごとの並びで近い著者だけを候補にして
+  類似度の高い上位 NEIGHBORS 人とつなぐ（全ペアを作らない）＋共著の著者どうし
+- 連結成分もラベル伝播も辺の数に比例する時間で終わる
+"""
+import heapq
+import math
+import random
+from array import array
+from collections import Counter, defaultdict
+
+TOP_FEATURES = 3
+WINDOW = 16          # 特徴ごとの並びで前後何人を候補にするか
+NEIGHBORS = 5        # 1人あたり残す辺の数
+MIN_SIMILARITY = 0.5
+CATEGORY_WEIGHT = 2
+COAUTHOR_WEIGHT = 1
+LPA_MAX_ITER = 20
+
+
+class CSRGraph:
+    """無向重み付きグラフ（CSR）"""
+
+    def __init__(self, n: int, edges: dict):
+        """edges: {(u, v): weight}（u < v）"""
+        deg = [0] * n
+        for u, v in edges:
+            deg[u] += 1
+            deg[v] += 1
+        self.indptr = array('i', [0] * (n + 1))
+        for i in range(n):
+            self.indptr[i + 1] = self.indptr[i] + deg[i]
+        self.indices = array('i', [0] * self.indptr[n])
+        self.weights = array('d', [0.0] * self.indptr[n])
+        fill = list(self.indptr[:n])
+        for (u, v), w in edges.items():
+            for a, b in ((u, v), (v, u)):
+                self.indices[fill[a]] = b
+                self.weights[fill[a]] = w
+                fill[a] += 1
+        self.n = n
+
+    def neighbors(self, u: int):
+        lo, hi = self.indptr[u], self.indptr[u + 1]
+        return zip(self.indices[lo:hi], self.weights[lo:hi])
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices) // 2
+
+
+def connected_components(g: CSRGraph) -> array:
+    """各ノードの成分番号（反復DFS、O(V+E)）"""
+    comp = array('i', [-1] * g.n)
+    c = 0
+    for s in range(g.n):
+        if comp[s] != -1:
+            continue
+        comp[s] = c
+        stack = [s]
+        while stack:
+            u = stack.pop()
+            for k in range(g.indptr[u], g.indptr[u + 1]):
+                v = g.indices[k]
+                if comp[v] == -1:
+                    comp[v] = c
+                    stack.append(v)
+        c += 1
+    return comp
+
+
+def label_propagation(g: CSRGraph, seed: int = 0) -> array:
+    """重み付きラベル伝播（1反復 O(E)、同点なら今のラベル→小さいラベル）"""
+    labels = array('i', range(g.n))
+    order = list(range(g.n))
+    rng = random.Random(seed)
+    for _ in range(LPA_MAX_ITER):
+        rng.shuffle(order)
+        changed = 0
+        for u in order:
+            votes = defaultdict(float)
+            for v, w in g.neighbors(u):
+                votes[labels[v]] += w
+            if not votes:
+                continue
+            best = max(votes.values())
+            if votes.get(labels[u]) == best:
+                continue
+            new = min(l for l, w in votes.items() if w == best)
+            labels[u] = new
+            changed += 1
+        if not changed:
+            break
+    return labels
+
+
+def split_authors(author_field: str) -> list[str]:
+    return [a.strip() for a in author_field.split(',') if a.strip()]
+
+
+def build_author_graphs(books: list[dict]):
+    """著者–特徴の2部グラフと著者–著者グラフを作る
+
+    返り値: (authors, features, bipartite, author_graph, author_features, author_books)
+    bipartite のノードは 著者0..A-1 の後に 特徴A..A+F-1 が続く
+    """
+    author_books = defaultdict(list)
+    feat_weight = defaultdict(Counter)   # author -> Counter(feature -> weight)
+    coauthor_pairs = Counter()
+    for b in books:
+        names = split_authors(b.get('author', ''))
+        for a in names:
+            author_books[a].append(b)
+            for theme, score in b.get('themes', []):
+                feat_weight[a][f"テーマ:{theme}"] += score
+            if b.get('category'):
+                feat_weight[a][f"カテゴリ:{b['category'].split(',')[0].strip()}"] += CATEGORY_WEIGHT
+        for i, a in enumerate(names):
+            for c in names[i + 1:]:
+                if a != c:
+                    coauthor_pairs[tuple(sorted((a, c)))] += 1
+
+    authors = sorted(author_books, key=lambda a: (-len(author_books[a]), a))
+    aid = {a: i for i, a in enumerate(authors)}
+    author_features = {a: feat_weight[a].most_common(TOP_FEATURES) for a in authors}
+
+    features = sorted({f for fs in author_features.values() for f, _ in fs})
+    fid = {f: len(authors) + i for i, f in enumerate(features)}
+
+    # 著者–特徴（2部グラフ）
+    bi_edges = {}
+    members = defaultdict(list)  # feature -> [(weight, author_id)]
+    for a, fs in author_features.items():
+        for f, w in fs:
+            bi_edges[(aid[a], fid[f])] = float(w)
+            members[f].append((w, aid[a]))
+    bipartite = CSRGraph(len(authors) + len(features), bi_edges)
+
+    # 著者–著者: 各著者について、同じ特徴を持つ著者のうち重みの近い WINDOW 人を候補にし、
+    # IDF重み付きのコサイン類似度が高い上位 NEIGHBORS 人とだけつなぐ（kNNグラフ）
+    idf = {f: math.log(len(authors) / len(lst)) + 1 for f, lst in members.items()}
+    vecs = []
+    for a in authors:
+        v = {f: w * idf[f] for f, w in author_features[a]}
+        norm = math.sqrt(sum(x * x for x in v.values())) or 1.0
+        vecs.append({f: x / norm for f, x in v.items()})
+    pos = {}
+    for f, lst in members.items():
+        lst.sort(key=lambda x: (-x[0], x[1]))
+        pos[f] = {u: i for i, (_, u) in enumerate(lst)}
+    aa_edges = defaultdict(float)
+    for u, a in enumerate(authors):
+        cand = set()
+        for f, _ in author_features[a]:
+            i = pos[f][u]
+            lst = members[f]
+            cand.update(v for _, v in lst[max(0, i - WINDOW):i + WINDOW + 1])
+        cand.discard(u)
+        sims = []
+        for v in cand:
+            sim = sum(x * vecs[v].get(f, 0.0) for f, x in vecs[u].items())
+            if sim >= MIN_SIMILARITY:
+                sims.append((sim, v))
+        for sim, v in heapq.nlargest(NEIGHBORS, sims):
+            key = (min(u, v), max(u, v))
+            aa_edges[key] = max(aa_edges[key], sim)
+    for (a, c), n in coauthor_pairs.items():
+        key = (min(aid[a], aid[c]), max(aid[a], aid[c]))
+        aa_edges[key] += COAUTHOR_WEIGHT * n
+    author_graph = CSRGraph(len(authors), aa_edges)
+
+    return authors, features, bipartite, author_graph, author_features, author_books
+
+
+def author_clusters(books: list[dict]) -> dict:
+    """著者クラスターを求めてレポート用にまとめる"""
+    authors, features, bipartite, ag, author_features, author_books = build_author_graphs(books)
+    if not authors:
+        return {'authors': 0, 'edges': 0, 'components': 0, 'clusters': []}
+
+    comp = connected_components(ag)
+    n_components = len(set(comp))
+    labels = label_propagation(ag)
+
+    groups = defaultdict(list)
+    for i in range(len(authors)):
+        groups[labels[i]].append(i)
+
+    clusters = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        # 2部グラフの隣接（著者 → 特徴）を足し合わせてクラスターの共通点にする
+        feats = Counter()
+        for i in members:
+            for j, w in bipartite.neighbors(i):
+                feats[features[j - len(authors)]] += w
+        clusters.append({
+            'authors': [authors[i] for i in members],  # 冊数の多い順
+            'books': sum(len(author_books[authors[i]]) for i in members),
+            'features': [f for f, _ in feats.most_common(3)],
+        })
+    clusters.sort(key=lambda c: (-c['books'], -len(c['authors'])))
+    return {
+        'authors': len(authors),
+        'edges': ag.edge_count,
+        'components': n_components,
+        'clusters': clusters,
+    }
@@ -11,6 +11,8 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+from link_graph import iter_links
+
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
@@ -204,7 +206,7 @@ def get_last_reading_note_date() -> str | None:
         return None
 
     text = READING_NOTE.read_text(encoding='utf-8')
-    dates = re.findall(r'\[\[(\d{4}-\d{2}-\d{2})\]\]', text)
+    dates = [t for t in iter_links(text) if re.fullmatch(r'\d{4}-\d{2}-\d{2}', t)]
     return dates[-1] if dates else None
 
 
@@ -218,6 +220,8 @@ def extract_reading_from_diary(date_str: str) -> list[str]:
     lines = []
     in_reading = False
 
+    # 転記は本の行の下の続きや引用も含めるので、セクションは「######」か「---」まで
+    # （本の一覧を取るだけの link_graph.reading_section より長い）
     for line in text.splitlines():
         if '今日読んだ本' in line or '📚' in line:
             in_reading = True
@@ -254,11 +258,11 @@ def sync_reading_notes():
     current = start
     while current <= today:
         date_str = current.strftime('%Y-%m-%d')
-        reading_lines = extract_reading_from_diary(date_str)
+        book_lines = extract_reading_from_diary(date_str)
 
-        if reading_lines:
+        if book_lines:
             new_entries.append(f"\n[[{date_str}]]")
-            for line in reading_lines:
+            for line in book_lines:
                 new_entries.append(line)
             added_dates += 1
 
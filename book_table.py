@@ -0,0 +1,180 @@
+"""
+📚 本のライフサイクル表
+日記の📚セクションから、本ごとの 初出日・最終日・読了日・読書日数 を
+canonical book id をキーにした表として持ち、日記の変更に合わせて差分更新する。
+日記の📚セクションは読み直さず、リンクグラフ（link_graph）が抽出したものを使う。
+
+- 日記ごとの寄与（その日に出てきた本と読了フラグ）を覚えておき、
+  変更された日記だけ「古い寄与を取り消す → 新しい寄与を足す」
+- 📚セクションから読了マークを消せば、その日の読了も取り消される
+- 表は .cache/book_table.json に保存
+
+使い方:
+  python book_table.py          # 表を更新して一覧表示
+"""
+import re
+import sys
+import unicodedata
+from bisect import bisect_left, insort
+
+from link_graph import GRAPH_VERSION, LinkGraph, open_graph
+from vault_io import load_cache, save_cache
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+TABLE_CACHE = "book_table.json"
+TABLE_VERSION = 2
+# 日記ごとの寄与は📚セクションの抽出（link_graph.parse_reading）の結果なので、
+# 抽出の仕方が変わったら（GRAPH_VERSION が上がったら）stamp が同じでも作り直す
+PARSER_VERSION = GRAPH_VERSION
+
+
+def book_id(title: str) -> str:
+    """表記ゆれ（全角英数・空白）を吸収したキー"""
+    return ' '.join(unicodedata.normalize('NFKC', title).split())
+
+
+class BookTable:
+    """canonical book id → {title, dates, finished} の表
+
+    dates / finished は日付文字列のソート済みリスト（同じ日に2回出てきたら2件）。
+    first / last / days_seen はここから引くだけで求まる。
+    """
+
+    def __init__(self, books=None, diaries=None):
+        self.books = books or {}      # id -> {'title', 'dates', 'finished'}
+        self.diaries = diaries or {}  # 日記ファイル名 -> {'date', 'stamp', 'books': [[title, finished], ...]}
+
+    # ─── 差分更新 ───
+
+    def apply(self, name: str, date_str: str, books: list[dict], stamp=None):
+        """1日分の日記の寄与を表に反映（既存の寄与は先に取り消す）"""
+        self.retract(name)
+        contrib = [[b['title'], bool(b.get('finished'))] for b in books]
+        self.diaries[name] = {'date': date_str, 'stamp': stamp, 'books': contrib}
+        for title, finished in contrib:
+            rec = self.books.setdefault(book_id(title), {'title': title, 'dates': [], 'finished': []})
+            if not rec['dates'] or date_str >= rec['dates'][-1]:
+                rec['title'] = title
+            insort(rec['dates'], date_str)
+            if finished:
+                insort(rec['finished'], date_str)
+
+    def retract(self, name: str):
+        """日記1つ分の寄与を取り消す"""
+        old = self.diaries.pop(name, None)
+        if not old:
+            return
+        date_str = old['date']
+        for title, finished in old['books']:
+            key = book_id(title)
+            rec = self.books.get(key)
+            if rec is None:
+                continue
+            _remove_sorted(rec['dates'], date_str)
+            if finished:
+                _remove_sorted(rec['finished'], date_str)
+            if not rec['dates']:
+                del self.books[key]
+
+    def update(self, graph: LinkGraph) -> tuple[int, int]:
+        """リンクグラフの日記を見て、変更・追加・削除された日記だけ反映する"""
+        seen = set()
+        changed = 0
+        for name, stamp, books in sorted(graph.diaries()):
+            m = re.match(r'(\d{4}-\d{2}-\d{2})', name)
+            if not m:
+                continue
+            seen.add(name)
+            old = self.diaries.get(name)
+            if old and old['stamp'] == stamp:
+                continue
+            self.apply(name, m.group(1), books, stamp)
+            changed += 1
+        removed = [name for name in self.diaries if name not in seen]
+        for name in removed:
+            self.retract(name)
+        return changed, len(removed)
+
+    @classmethod
+    def from_entries(cls, entries: list[dict]) -> 'BookTable':
+        """extract_all_data() の結果からメモリ上に表を組み立てる"""
+        table = cls()
+        for e in entries:
+            if e.get('books'):
+                table.apply(e['date'], e['date'], e['books'])
+        return table
+
+    # ─── 参照 ───
+
+    def record(self, key: str) -> dict:
+        rec = self.books[key]
+        return {
+            'title': rec['title'],
+            'first': rec['dates'][0],
+            'last': rec['dates'][-1],
+            'finished': rec['finished'][-1] if rec['finished'] else None,
+            'days_seen': len(rec['dates']),
+        }
+
+    def get(self, title: str) -> dict | None:
+        key = book_id(title)
+        return self.record(key) if key in self.books else None
+
+    def records(self) -> list[dict]:
+        """全冊のサマリー（初出日順）"""
+        return sorted((self.record(k) for k in self.books), key=lambda r: (r['first'], r['title']))
+
+    def touched_between(self, start: str, end: str) -> list[str]:
+        """期間内に📚セクションに出てきた本のタイトル"""
+        titles = []
+        for rec in self.books.values():
+            i = bisect_left(rec['dates'], start)
+            if i < len(rec['dates']) and rec['dates'][i] <= end:
+                titles.append(rec['title'])
+        return titles
+
+    def finished_between(self, start: str, end: str) -> list[str]:
+        """期間内に読了マークが付いた本のタイトル（日記の順、読了マークの数だけ）"""
+        hits = []
+        for name in sorted(self.diaries):
+            d = self.diaries[name]
+            if start <= d['date'] <= end:
+                hits.extend(title for title, finished in d['books'] if finished)
+        return hits
+
+    # ─── 保存 ───
+
+    @classmethod
+    def load(cls) -> 'BookTable':
+        cache = load_cache(TABLE_CACHE, TABLE_VERSION)
+        if cache.get('parser') != PARSER_VERSION:
+            return cls()
+        return cls(cache.get('books'), cache.get('diaries'))
+
+    def save(self):
+        save_cache(TABLE_CACHE, TABLE_VERSION, {'parser': PARSER_VERSION, 'books': self.books, 'diaries': self.diaries})
+
+
+def _remove_sorted(lst: list, value):
+    i = bisect_left(lst, value)
+    if i < len(lst) and lst[i] == value:
+        del lst[i]
+
+
+def open_table(graph: LinkGraph | None = None) -> BookTable:
+    """保存済みの表を読み込み、日記の変更分だけ反映して返す（graph がなければここで開く）"""
+    table = BookTable.load()
+    changed, removed = table.update(graph or open_graph())
+    if changed or removed:
+        table.save()
+    print(f"   📚 本の表: {len(table.books)}冊（日記 更新{changed} / 削除{removed}）")
+    return table
+
+
+if __name__ == "__main__":
+    table = open_table()
+    for b in table.records():
+        status = 'done:' + b['finished'] if b['finished'] else '...'
+        print(f"{b['first']}~{b['last']} ({b['days_seen']}d) [{status}] {b['title']}")
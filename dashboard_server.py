@@ -0,0 +1,374 @@
+"""
+🌐 ローカル配信サーバー（python life_dashboard.py --serve）
+docs/ をそのまま配信し、パース済みの日記データの集計をJSONで返す。
+GitHub Pages に push しなくても、同じLANのスマホやPCから最新のダッシュボードが見られる。
+
+- docs/ のファイルはメモリに読み込んで配信する。ETag は中身のハッシュ（強いETag）で、
+  If-None-Match が合えば 304 を返す
+- Accept-Encoding に応じて横にある .br / .gz を返す（.gz がないファイルは読み込むときに gzip しておく）
+- ハッシュ付きのファイル（data/・vendor/・assets/）は immutable、それ以外は毎回ETagで確認させる
+- 日記が変わったら作り直す（WATCH_INTERVAL 秒ごとに更新スタンプを見る）。作り直している間は前の内容を配信する
+- API（JSON）:
+    /api/range?from=2026-01-01&to=2026-01-31&metrics=hours,score
+        日ごとの値と期間の集計（記録日数・平均・最小・最大）。from / to を省くと直近30日、metrics を省くと全部
+    /api/months?metrics=hours,score
+        月ごとの集計
+    /api/meta
+        使える指標と記録のある期間
+  合計と日数は累積和で持っておくので平均は期間の長さによらず O(1)。同じクエリの結果（圧縮版も）はキャッシュする
+- 標準ライブラリの asyncio だけで動く。HTTP/1.1 の keep-alive に対応しているので、
+  ab -k -c 50 -n 10000 "http://127.0.0.1:8000/api/range?metrics=hours" のような負荷試験がそのまま使える
+"""
+import asyncio
+import gzip
+import hashlib
+import mimetypes
+import re
+import socket
+from datetime import date, timedelta
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import svg_charts
+import wire_format
+from vault_io import file_stamp
+
+WATCH_INTERVAL = 10      # 日記の変更を見る間隔（秒）
+KEEPALIVE_TIMEOUT = 15   # 次のリクエストを待つ時間（秒）
+RANGE_DAYS = 30          # /api/range で from / to を省いたときの日数
+CACHE_SIZE = 256         # APIの結果をいくつまで持っておくか
+MIN_GZIP = 512           # これより小さいものは圧縮しない
+
+# 名前に内容ハッシュが入ったファイル（chart.1a2b3c4d5e.js, 2026-02.1a2b3c4d5e.json など）
+HASHED_RE = re.compile(r'\.[0-9a-f]{10}\.\w+$')
+# 圧縮して配信する種類
+COMPRESSIBLE = ('text/', 'application/json', 'application/javascript', 'application/manifest+json', 'image/svg+xml')
+# 優先する順（.br が置いてあれば gzip より先に使う）
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+STATUS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+          405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+mimetypes.add_type('application/manifest+json', '.webmanifest')
+mimetypes.add_type('application/javascript', '.js')
+
+
+def _etag(body: bytes, encoding: str | None = None) -> str:
+    """強いETag（圧縮版は別の表現なので別のETagにする）"""
+    tag = hashlib.sha256(body).hexdigest()[:16]
+    return f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
+
+
+def _variant(body: bytes, ctype: str, encoding: str | None = None) -> dict:
+    return {'body': body, 'etag': _etag(body, encoding), 'type': ctype}
+
+
+def _compressible(ctype: str) -> bool:
+    return ctype.startswith(COMPRESSIBLE)
+
+
+def accepted_encodings(header: str) -> set[str]:
+    """Accept-Encoding から受け取れる圧縮形式（q=0 は除く）"""
+    out = set()
+    for part in header.split(','):
+        name, _, params = part.strip().partition(';')
+        q = params.strip()
+        if q.startswith('q=') and q[2:].strip() in ('0', '0.0', '0.00', '0.000'):
+            continue
+        if name:
+            out.add(name.strip().lower())
+    return out
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match の比較（弱い比較なので W/ は外して比べる）"""
+    tags = [t.strip() for t in header.split(',')]
+    return '*' in tags or any(t.removeprefix('W/') == etag for t in tags)
+
+
+class StaticFiles:
+    """docs/ のメモリ上のコピー。URLのパス -> {'identity': 表現, 'gzip': 表現, ...}"""
+
+    def __init__(self, docs_dir: Path):
+        self.dir = Path(docs_dir)
+        self.files = {}
+        self.bytes = 0
+        for path in sorted(self.dir.rglob('*')):
+            rel = path.relative_to(self.dir)
+            if not path.is_file() or path.suffix in ('.gz', '.br') or any(p.startswith('.') for p in rel.parts):
+                continue
+            body = path.read_bytes()
+            ctype = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+            if ctype.startswith('text/') or ctype in ('application/json', 'application/javascript'):
+                ctype += '; charset=utf-8'
+            variants = {'identity': _variant(body, ctype)}
+            for enc, suffix in ENCODINGS:
+                alt = path.with_name(path.name + suffix)
+                if alt.exists():
+                    variants[enc] = _variant(alt.read_bytes(), ctype, enc)
+            if 'gzip' not in variants and _compressible(ctype) and len(body) >= MIN_GZIP:
+                variants['gzip'] = _variant(gzip.compress(body, 6, mtime=0), ctype, 'gzip')
+            self.files[rel.as_posix()] = variants
+            self.bytes += sum(len(v['body']) for v in variants.values())
+
+    def lookup(self, path: str) -> dict | None:
+        """URLのパス（先頭の / なし）から。ディレクトリは index.html"""
+        if path == '' or path.endswith('/'):
+            path += 'index.html'
+        return self.files.get(path) or self.files.get(path + '/index.html')
+
+
+class Aggregates:
+    """日記データの日ごとの列と累積和（作り直すまで変わらないので、APIの結果もここにキャッシュする）"""
+
+    def __init__(self, data: list[dict]):
+        self.daily = svg_charts.Daily(data)
+        self.columns = self.daily.columns
+        self.length = len(next(iter(self.columns.values())))
+        self.first = self.daily.start
+        self.last = self.first + timedelta(days=self.length - 1)
+        # 指標 -> (値の累積和, 記録日数の累積和)。[lo, hi) の合計は sums[hi] - sums[lo]
+        self.prefix = {}
+        for k, col in self.columns.items():
+            sums, counts = [0.0], [0]
+            for v in col:
+                sums.append(sums[-1] + (v or 0))
+                counts.append(counts[-1] + (v is not None))
+            self.prefix[k] = (sums, counts)
+        self.cache = {}
+
+    def _metrics(self, query: dict) -> list[str]:
+        names = [m for m in ','.join(query.get('metrics', [])).split(',') if m] or list(self.columns)
+        unknown = [m for m in names if m not in self.columns]
+        if unknown:
+            raise ValueError(f"unknown metrics: {', '.join(unknown)}（使えるもの: {', '.join(self.columns)}）")
+        return names
+
+    def _stats(self, k: str, lo: int, hi: int) -> dict:
+        sums, counts = self.prefix[k]
+        n = counts[hi] - counts[lo]
+        values = [v for v in self.columns[k][lo:hi] if v is not None]
+        return {
+            'count': n,
+            'avg': round((sums[hi] - sums[lo]) / n, 3) if n else None,
+            'min': min(values) if values else None,
+            'max': max(values) if values else None,
+        }
+
+    def _index(self, d: date) -> int:
+        """日付 -> 列の位置（範囲外は端に寄せる）"""
+        return min(max((d - self.first).days, 0), self.length)
+
+    def range(self, query: dict) -> dict:
+        """/api/range: from〜to（両端含む）の日ごとの値と集計"""
+        metrics = self._metrics(query)
+        try:
+            last = date.fromisoformat(query['to'][0]) if 'to' in query else self.last
+            first = date.fromisoformat(query['from'][0]) if 'from' in query else last - timedelta(days=RANGE_DAYS - 1)
+        except ValueError:
+            raise ValueError("from / to は YYYY-MM-DD で指定してください") from None
+        if first > last:
+            raise ValueError("from が to より後になっています")
+        lo, hi = self._index(first), self._index(last + timedelta(days=1))
+        return {
+            'from': first.isoformat(),
+            'to': last.isoformat(),
+            'base': (self.first + timedelta(days=lo)).isoformat(),   # values[0] の日付（記録のない日は null）
+            'metrics': {k: {'values': self.columns[k][lo:hi], **self._stats(k, lo, hi)} for k in metrics},
+        }
+
+    def months(self, query: dict) -> dict:
+        """/api/months: 月ごとの集計"""
+        metrics = self._metrics(query)
+        out = {'month': [], **{k: [] for k in metrics}}
+        if not self.length:
+            return out
+        m = self.first.replace(day=1)
+        while m <= self.last:
+            nxt = (m + timedelta(days=32)).replace(day=1)
+            lo, hi = self._index(m), self._index(nxt)
+            out['month'].append(m.strftime('%Y-%m'))
+            for k in metrics:
+                out[k].append(self._stats(k, lo, hi))
+            m = nxt
+        return out
+
+    def meta(self, query: dict) -> dict:
+        """/api/meta: 使える指標と記録のある期間"""
+        return {'metrics': list(self.columns), 'first': self.first.isoformat(), 'last': self.last.isoformat(),
+                'days': self.length}
+
+    def respond(self, route: str, raw_query: str) -> dict:
+        """APIの結果の表現（{'identity', 'gzip'}）。同じクエリはキャッシュから返す"""
+        key = (route, raw_query)
+        hit = self.cache.get(key)
+        if hit is None:
+            body = wire_format.dumps(getattr(self, route)(parse_qs(raw_query))).encode('utf-8')
+            ctype = 'application/json; charset=utf-8'
+            hit = {'identity': _variant(body, ctype)}
+            if len(body) >= MIN_GZIP:
+                hit['gzip'] = _variant(gzip.compress(body, 6, mtime=0), ctype, 'gzip')
+            if len(self.cache) >= CACHE_SIZE:
+                self.cache.pop(next(iter(self.cache)))
+            self.cache[key] = hit
+        return hit
+
+
+API_ROUTES = {'/api/range': 'range', '/api/months': 'months', '/api/meta': 'meta'}
+
+
+class DashboardServer:
+    """docs/ の静的ファイルと集計APIを配信する"""
+
+    def __init__(self, docs_dir: Path, data: list[dict]):
+        self.docs_dir = Path(docs_dir)
+        self.load(StaticFiles(self.docs_dir), Aggregates(data))
+        self.requests = 0
+
+    def load(self, files: StaticFiles, api: Aggregates):
+        # 作り直しは別スレッドで作ってからまとめて差し替える（配信中のリクエストは前の内容のまま）
+        self.files, self.api = files, api
+
+    def respond(self, method: str, target: str, headers: dict) -> tuple[int, list, bytes]:
+        """(ステータス, ヘッダー, 本文)。HEAD でも本文を返す（送るかどうかは呼び出し側）"""
+        if method not in ('GET', 'HEAD'):
+            return self._error(405, 'GET / HEAD のみ', [('Allow', 'GET, HEAD')])
+        url = urlsplit(target)
+        path = unquote(url.path)
+        if path in API_ROUTES:
+            try:
+                variants = self.api.respond(API_ROUTES[path], url.query)
+            except ValueError as e:
+                return self._error(400, str(e))
+            cache = 'no-cache'
+        else:
+            variants = self.files.lookup(path.lstrip('/'))
+            if variants is None:
+                return self._error(404, f'{path} はありません')
+            cache = 'public, max-age=31536000, immutable' if HASHED_RE.search(path) else 'no-cache'
+
+        accepted = accepted_encodings(headers.get('accept-encoding', ''))
+        encoding = next((enc for enc, _ in ENCODINGS if enc in variants and enc in accepted), None)
+        v = variants[encoding or 'identity']
+        out = [('Content-Type', v['type']), ('ETag', v['etag']), ('Cache-Control', cache)]
+        if len(variants) > 1:
+            out.append(('Vary', 'Accept-Encoding'))
+        if encoding:
+            out.append(('Content-Encoding', encoding))
+        if etag_matches(headers.get('if-none-match', ''), v['etag']):
+            return 304, out, b''
+        return 200, out, v['body']
+
+    def _error(self, status: int, message: str, extra=()) -> tuple[int, list, bytes]:
+        body = wire_format.dumps({'error': message}).encode('utf-8')
+        return status, [('Content-Type', 'application/json; charset=utf-8'), *extra], body
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """1つの接続（keep-alive なら続けて何件でも）"""
+        try:
+            while True:
+                line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+                if not line.strip():
+                    break
+                try:
+                    method, target, version = line.decode('latin-1').split()
+                except ValueError:
+                    status, headers, body = self._error(400, 'リクエスト行が読めません')
+                    self._send(writer, 'HTTP/1.1', status, headers, body, keep_alive=False)
+                    break
+                headers = {}
+                while (h := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    name, _, value = h.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                if int(headers.get('content-length') or 0):
+                    await reader.readexactly(int(headers['content-length']))
+                conn = headers.get('connection', '').lower()
+                keep_alive = conn == 'keep-alive' if version == 'HTTP/1.0' else conn != 'close'
+                try:
+                    status, out, body = self.respond(method, target, headers)
+                except Exception as e:  # 1件の失敗でサーバーを止めない
+                    print(f"   ⚠️ {method} {target}: {e}")
+                    status, out, body = self._error(500, str(e))
+                self.requests += 1
+                self._send(writer, version, status, out, b'' if method == 'HEAD' else body, keep_alive,
+                           length=len(body))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _send(writer, version: str, status: int, headers: list, body: bytes, keep_alive: bool,
+              length: int | None = None):
+        lines = [f"{version if version in ('HTTP/1.0', 'HTTP/1.1') else 'HTTP/1.1'} {status} {STATUS[status]}"]
+        lines += [f"{k}: {v}" for k, v in headers]
+        if status != 304:
+            lines.append(f"Content-Length: {len(body) if length is None else length}")
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+
+    async def watch(self, watch_dir: Path, rebuild, interval: float = WATCH_INTERVAL):
+        """日記が変わったら rebuild()（docs/ を書き直してデータを返す）を別スレッドで動かして差し替える"""
+        stamp = _dir_stamp(watch_dir)
+        while True:
+            await asyncio.sleep(interval)
+            current = _dir_stamp(watch_dir)
+            if current == stamp:
+                continue
+            stamp = current
+            print("\n🔁 日記が変わりました。作り直します...")
+            try:
+                data = await asyncio.to_thread(rebuild)
+                files = await asyncio.to_thread(StaticFiles, self.docs_dir)
+            except Exception as e:  # 作り直せなければ前の内容のまま配信を続ける
+                print(f"   ⚠️ 作り直しに失敗しました: {e}")
+                continue
+            self.load(files, Aggregates(data))
+            print(f"   ✓ 配信する内容を更新しました（{len(files.files)}ファイル）")
+
+
+def _dir_stamp(watch_dir: Path) -> list:
+    """フォルダ内の .md の更新スタンプ（追加・削除・更新のどれでも変わる）"""
+    stamps = []
+    for p in sorted(Path(watch_dir).glob('*.md')):
+        try:
+            stamps.append((p.name, *file_stamp(p)))
+        except OSError:
+            pass
+    return stamps
+
+
+def _lan_address() -> str | None:
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(('10.255.255.255', 1))   # 実際には送らない（経路からLAN側のアドレスを知るだけ）
+            return s.getsockname()[0]
+    except OSError:
+        return None
+
+
+async def _serve(server: DashboardServer, host: str, port: int, watch_dir, rebuild):
+    srv = await asyncio.start_server(server.handle, host, port, backlog=512)
+    print(f"\n🌐 配信中: http://127.0.0.1:{port}/（Ctrl+C で終了）")
+    lan = _lan_address() if host in ('0.0.0.0', '') else None
+    if lan:
+        print(f"   📱 同じLANから: http://{lan}:{port}/  ・  /sleep.html")
+    print(f"   📏 {len(server.files.files)}ファイル（圧縮版込み {server.files.bytes / 1024:.0f}KB）をメモリから配信")
+    tasks = []
+    if watch_dir is not None and rebuild is not None:
+        tasks.append(asyncio.create_task(server.watch(watch_dir, rebuild)))
+    async with srv:
+        await srv.serve_forever()
+
+
+def serve(docs_dir: Path, data: list[dict], host: str = '0.0.0.0', port: int = 8000,
+          watch_dir: Path | None = None, rebuild=None):
+    """Ctrl+C まで配信する。watch_dir と rebuild を渡すと日記の変更で作り直す"""
+    server = DashboardServer(docs_dir, data)
+    try:
+        asyncio.run(_serve(server, host, port, watch_dir, rebuild))
+    except KeyboardInterrupt:
+        print(f"\n👋 終了しました（{server.requests}件のリクエスト）")
@@ -0,0 +1,153 @@
+"""
+📦 ダッシュボードのデータファイル
+docs/data/ にデータJSONを内容ハッシュ付きのファイル名（summary.1a2b3c4d5e.json）で書き、
+固定名の docs/data/latest.json（マニフェスト）に現在のファイル名を載せる。
+
+- 日ごとのデータは月ごとのシャード（2026-02.1a2b3c4d5e.json）に分ける。
+  ページは表示する期間・月のシャードだけを fetch する（履歴が増えても初回表示の量は一定）
+- HTMLはデータを埋め込まず latest.json → ハッシュ付きファイル の順に fetch する
+  （HTMLはテンプレートが変わらない限り同じ中身のまま、毎日変わるのはデータだけ）
+- ハッシュ付きファイルは中身が変わらない限り同じ名前なので、ずっとキャッシュしてよい。
+  過去の月のシャードは日記を直さない限り名前も変わらない
+- シャードは wire_format の列形式で書き、.gz / .br の圧縮版も横に置く
+- 気分メモの全文は月ごとの notes-YYYY-MM（{日付: 全文}）に分ける。開いたときだけ読むので precache しない
+- 月のシャードも precache するのは既定の期間（PRECACHE_DAYS）の分だけ。
+  それより前の月は初めて表示したときに Service Worker の cache-first で取る
+- latest.json から参照されなくなった古いファイルは削除する
+"""
+import hashlib
+import json
+import re
+from datetime import date, timedelta
+from pathlib import Path
+
+import wire_format
+from template_render import write_if_changed
+
+DATA_DIRNAME = "data"
+LATEST = "latest.json"
+HASH_LEN = 10
+
+# latest.json には載せるが、Service Worker の precache には入れないもの（ページが必要なときだけ fetch する）
+LAZY = ('notes',)
+# precache する月のシャードの日数（ダッシュボードの既定の期間。dashboard_template.html の period）
+PRECACHE_DAYS = 30
+
+# name.<hash>.json とその圧縮版（.gz / .br）
+HASHED_RE = re.compile(r'^(?P<base>.+\.[0-9a-f]{%d}\.json)(?:\.gz|\.br)?$' % HASH_LEN)
+
+
+def content_hash(payload: bytes) -> str:
+    return hashlib.sha256(payload).hexdigest()[:HASH_LEN]
+
+
+class DataWriter:
+    """1回のビルドで書くデータファイルをまとめて管理する"""
+
+    def __init__(self, docs_dir: Path):
+        self.dir = Path(docs_dir) / DATA_DIRNAME
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.entries = {}   # 論理名 -> docs からの相対URL
+        self.written = {}   # Path -> 書き込んだか
+        self.side = set()   # latest.json には載せないが残すハッシュ付きファイルのURL（睡眠アプリの差分フィード）
+        self.sizes = {}     # シャードの合計バイト数: 'rows'（従来の行形式）/ '.json' / '.gz' / '.br'
+
+    def _write_hashed(self, name: str, payload_json: str, sizes: dict | None = None) -> str:
+        payload = payload_json.encode('utf-8')
+        path = self.dir / f"{name}.{content_hash(payload)}.json"
+        changed = write_if_changed(path, [payload])
+        self.written[path] = changed
+        lengths = {'.json': len(payload)}
+        # 圧縮版（元ファイルが変わらず圧縮版もそろっていれば作り直さない）
+        suffixes = ('.gz', '.br') if wire_format.brotli is not None else ('.gz',)
+        zpaths = {sfx: path.with_name(path.name + sfx) for sfx in suffixes}
+        if not changed and all(z.exists() for z in zpaths.values()):
+            lengths.update({sfx: z.stat().st_size for sfx, z in zpaths.items()})
+            self.written.update({z: False for z in zpaths.values()})
+        else:
+            for sfx, blob in wire_format.compressed_variants(payload).items():
+                self.written[zpaths[sfx]] = write_if_changed(zpaths[sfx], [blob])
+                lengths[sfx] = len(blob)
+        if sizes is not None:
+            for k, n in lengths.items():
+                sizes[k] = sizes.get(k, 0) + n
+        return f"{DATA_DIRNAME}/{path.name}"
+
+    def write(self, name: str, payload_json: str) -> str:
+        """name.<hash>.json を書いて docs からの相対URLを返す"""
+        url = self._write_hashed(name, payload_json)
+        self.entries[name] = url
+        return url
+
+    def write_side(self, name: str, payload_json: str) -> str:
+        """latest.json に載せないハッシュ付きファイルを書く（finish で消されない）"""
+        url = self._write_hashed(name, payload_json)
+        self.side.add(url)
+        return url
+
+    def write_months(self, entries: list[dict]) -> dict[str, str]:
+        """日ごとのデータを月ごとのシャードに分けて書く。{'YYYY-MM': URL} を返す"""
+        by_month = {}
+        for e in entries:
+            by_month.setdefault(e['date'][:7], []).append(e)
+        months = {}
+        for m, rows in sorted(by_month.items()):
+            rows_json = json.dumps(rows, ensure_ascii=False)
+            self.sizes['rows'] = self.sizes.get('rows', 0) + len(rows_json.encode('utf-8'))
+            months[m] = self._write_hashed(m, wire_format.dumps(wire_format.encode_rows(rows)), self.sizes)
+        self.entries['months'] = months
+        return months
+
+    def write_notes(self, notes: dict[str, dict[str, str]]) -> dict[str, str]:
+        """気分メモの全文を月ごとに notes-YYYY-MM として書く（notes は {'YYYY-MM': {日付: 全文}}）"""
+        self.entries['notes'] = {m: self._write_hashed(f"notes-{m}", wire_format.dumps(month))
+                                 for m, month in sorted(notes.items())}
+        return self.entries['notes']
+
+    def urls(self):
+        """latest.json に載っているハッシュ付きファイルのURL"""
+        for v in self.entries.values():
+            if isinstance(v, dict):
+                yield from v.values()
+            else:
+                yield v
+
+    def precache_urls(self, last: date, days: int = PRECACHE_DAYS):
+        """Service Worker の precache に入れるURL（LAZY のものと、last の days 日前の月より前のシャードを除く）"""
+        since = (last - timedelta(days=days)).strftime('%Y-%m')
+        for k, v in self.entries.items():
+            if k in LAZY:
+                continue
+            if k == 'months':
+                yield from (url for m, url in v.items() if m >= since)
+            elif isinstance(v, dict):
+                yield from v.values()
+            else:
+                yield v
+
+    def finish(self) -> dict[Path, bool]:
+        """latest.json を更新し、どこからも参照されなくなったハッシュ付きファイルを消す"""
+        latest = json.dumps(self.entries, ensure_ascii=False, indent=1, sort_keys=True) + '\n'
+        path = self.dir / LATEST
+        self.written[path] = write_if_changed(path, [latest.encode('utf-8')])
+        keep = {Path(url).name for url in (*self.urls(), *self.side)}
+        removed = 0
+        for f in self.dir.iterdir():
+            m = HASHED_RE.match(f.name)
+            if m and m.group('base') not in keep:
+                f.unlink()
+                removed += 1
+        if removed:
+            print(f"   🗑️ 古いデータファイル: {removed}件削除")
+        return self.written
+
+    def size_report(self) -> str:
+        """月シャードの合計サイズ（従来の行形式との比較）"""
+        def kb(n):
+            return f"{n / 1024:.1f}KB"
+        rows, col = self.sizes.get('rows', 0), self.sizes.get('.json', 0)
+        parts = [f"行形式 {kb(rows)} → 列形式 {kb(col)}" + (f"（-{1 - col / rows:.0%}）" if rows else '')]
+        for sfx, label in (('.gz', 'gzip'), ('.br', 'brotli')):
+            if sfx in self.sizes:
+                parts.append(f"{label} {kb(self.sizes[sfx])}")
+        return ' / '.join(parts)
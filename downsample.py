@@ -0,0 +1,83 @@
+"""
+📉 時系列の間引き（LTTB: Largest-Triangle-Three-Buckets）
+長い期間のグラフ（睡眠時間・スコア・歩数）用に、間引いた系列を解像度ごとに
+前もって作ってダッシュボードのデータに載せる。
+
+- LTTB は各バケットから「前に選んだ点と次のバケットの平均点」で作る三角形が
+  最大になる点を選ぶので、山と谷が残る
+- 元の点数が解像度以下の組み合わせは作らない（ブラウザ側で生データを使う）。
+  1日1点なので、作るのは RESOLUTIONS[0] 日より長い期間ボタン（今は「全期間」）だけ
+- ブラウザはキャンバスの幅に合う解像度を選ぶ
+"""
+from datetime import date, timedelta
+
+# 間引き後の点数
+RESOLUTIONS = (240, 480, 960)
+# ダッシュボードの期間ボタン（日数、0 = 全期間）
+PERIOD_BUTTONS = (7, 14, 30, 90, 0)
+# 間引く期間: 点数が RESOLUTIONS[0] を超えうるものだけ（7〜90日は間引くほどの点数にならない）
+PERIODS = tuple(d for d in PERIOD_BUTTONS if d == 0 or d > RESOLUTIONS[0])
+# 間引く系列: 名前 -> レコードのキー
+METRICS = {'hours': 'hours', 'score': 'score', 'steps': 'steps'}
+
+
+def lttb(points: list[tuple[float, float]], threshold: int) -> list[tuple[float, float]]:
+    """(x, y) の列を threshold 点に間引く（x は昇順）"""
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+    sampled = [points[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # 次のバケットの平均点
+        nxt_start = int((i + 1) * every) + 1
+        nxt_end = min(int((i + 2) * every) + 1, n)
+        span = nxt_end - nxt_start
+        avg_x = sum(p[0] for p in points[nxt_start:nxt_end]) / span
+        avg_y = sum(p[1] for p in points[nxt_start:nxt_end]) / span
+        # 今のバケットから三角形の面積が最大の点
+        ax, ay = points[a]
+        best, best_area = None, -1.0
+        for j in range(int(i * every) + 1, int((i + 1) * every) + 1):
+            px, py = points[j]
+            area = abs((ax - avg_x) * (py - ay) - (ax - px) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        a = best
+    sampled.append(points[-1])
+    return sampled
+
+
+def build_series(data: list[dict], today: date | None = None) -> dict:
+    """{系列名: {期間: [{'n', 'base', 'day', 'y'}, ...（n の昇順）]}}
+
+    期間は PERIODS のうち間引いた系列ができたものだけ。day は base からの日数。
+    元の点数が n 以下の解像度は含めない。
+    """
+    today = today or date.today()
+    out = {}
+    for name, key in METRICS.items():
+        rows = [(date.fromisoformat(e['date']).toordinal(), e[key]) for e in data if e.get(key)]
+        by_period = {}
+        for days in PERIODS:
+            start = (today - timedelta(days=days)).toordinal() if days else None
+            pts = [p for p in rows if start is None or p[0] >= start]
+            levels = []
+            for n in RESOLUTIONS:
+                if len(pts) <= n:
+                    break
+                s = lttb(pts, n)
+                base = s[0][0]
+                levels.append({
+                    'n': n,
+                    'base': date.fromordinal(base).isoformat(),
+                    'day': [x - base for x, _ in s],
+                    'y': [y for _, y in s],
+                })
+            if levels:
+                by_period[str(days)] = levels
+        if by_period:
+            out[name] = by_period
+    return out
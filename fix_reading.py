@@ -2,29 +2,36 @@
 読了マーク修正スクリプト
 日記本文で「読了」と書かれている本を、📚セクションの行にも「読了」を追加する。
 また、本文中で「読み終えた」と書かれている場合も検出する。
+
+- 1ファイルにつき1パス: 先に本文の「読了」「読み終え」行だけを拾い、
+  📚セクションの各タイトルはその行だけと照合する
+- ファイルはワーカープールで並列処理し、一時ファイル→renameで書き換える
+  （途中で中断しても、書き換え途中のファイルは残らない）
+
+使い方:
+  python fix_reading.py             # 修正を書き込む
+  python fix_reading.py --dry-run   # 変更内容をunified diffで表示するだけ
 """
 import re, sys
+import difflib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+import text_index
+from link_graph import first_link, reading_section
+from vault_io import atomic_write_text
+
 sys.stdout.reconfigure(encoding='utf-8')
 
 DIARY = Path(r"C:\Documents\Obsidian Vault\Main Vault\日記")
 DRY_RUN = '--dry-run' in sys.argv
+# これ以上のファイル数を処理するときだけプロセスプールを使う
+POOL_THRESHOLD = 32
 
 def find_reading_section(lines):
     """📚セクションの開始行と終了行を返す"""
-    start = None
-    for i, line in enumerate(lines):
-        if '今日読んだ本' in line or '📚' in line:
-            start = i
-            continue
-        if start is not None:
-            if line.strip().startswith('#') or (line.strip() and not line.strip().startswith('-')):
-                return start, i
-    if start is not None:
-        return start, len(lines)
-    return None, None
+    return reading_section(lines)
 
 def find_book_in_reading_section(lines, start, end, title):
     """📚セクション内で特定の本のある行番号を返す"""
@@ -33,71 +40,96 @@ def find_book_in_reading_section(lines, start, end, title):
             return i
     return None
 
-def check_body_for_dokuryo(lines, title, rs_start, rs_end):
-    """本文中で本タイトルと同じ行に読了があるか（📚セクション外のみ）"""
+def index_dokuryo_lines(lines, rs_start, rs_end):
+    """本文（📚セクション外）で読了/読み終え を含む行を (行番号, 行) のリストで返す"""
+    hits = []
     for i, line in enumerate(lines):
         # Skip reading section itself
         if rs_start <= i < rs_end:
             continue
-        # Must have book title AND 読了/読み終え on SAME line
-        if title in line and ('読了' in line or '読み終え' in line):
+        if '読了' in line or '読み終え' in line:
             # Exclude "読了済み" (means previously finished, not this book)
             if '読了済み' in line:
                 continue
-            return True, i
-    return False, -1
+            hits.append((i, line))
+    return hits
 
-def main():
-    total_fixes = 0
-    fix_details = []
-    
-    for f in sorted(DIARY.glob("*.md")):
-        m = re.match(r'(\d{4}-\d{2}-\d{2})', f.stem)
-        if not m:
+def fix_file(path, dry_run=False):
+    """1ファイルを修正して (日付, [(title, OLD, NEW)], diff) を返す"""
+    m = re.match(r'(\d{4}-\d{2}-\d{2})', path.stem)
+    if not m:
+        return None, [], ''
+    date = m.group(1)
+    # 改行コードはそのまま残す（CRLF の日記を LF で書き直さない）
+    with open(path, encoding='utf-8', newline='') as f:
+        text = f.read()
+    lines = text.splitlines(keepends=True)
+
+    rs_start, rs_end = find_reading_section(lines)
+    if rs_start is None:
+        return date, [], ''
+    mentions = index_dokuryo_lines(lines, rs_start, rs_end)
+    if not mentions:
+        return date, [], ''
+
+    fixes = []
+    for i in range(rs_start, rs_end):
+        title = first_link(lines[i])
+        if not title:
             continue
-        date = m.group(1)
-        text = f.read_text(encoding='utf-8')
-        lines = text.splitlines()
-        
-        rs_start, rs_end = find_reading_section(lines)
-        if rs_start is None:
+        # Already marked as 読了?
+        if '読了' in lines[i]:
             continue
-        
-        modified = False
-        
-        # Get all books from reading section
-        for i in range(rs_start, rs_end):
-            bm = re.search(r'\[\[(.+?)(?:\|.+?)?\]\]', lines[i])
-            if not bm:
-                continue
-            title = bm.group(1)
-            
-            # Already marked as 読了?
-            if '読了' in lines[i]:
-                continue
-            
-            # Check body text for 読了 mention of this book
-            found, body_line = check_body_for_dokuryo(lines, title, rs_start, rs_end)
-            if found:
-                # Add 読了 to the reading section line
-                old_line = lines[i]
-                # Insert 読了 after the [[book]] link
-                new_line = old_line.replace(']]', ']]　読了', 1)
-                lines[i] = new_line
-                modified = True
-                total_fixes += 1
-                fix_details.append((date, title))
-                print(f"  ✓ {date}: {title}")
-                print(f"    OLD: {old_line.strip()}")
-                print(f"    NEW: {new_line.strip()}")
-        
-        # Also handle: book mentioned with 読了 in body but NOT in reading section at all
-        # (user mentioned 裁く眼 was "読み終えた" on 1/28 referring to 1/27)
-        
-        if modified and not DRY_RUN:
-            f.write_text('\n'.join(lines), encoding='utf-8')
-    
-    print(f"\n合計: {total_fixes} 冊修正" + (" (DRY RUN)" if DRY_RUN else ""))
+        # Must have book title AND 読了/読み終え on SAME line
+        if any(title in line for _, line in mentions):
+            old_line = lines[i]
+            # Insert 読了 after the [[book]] link
+            lines[i] = old_line.replace(']]', ']]　読了', 1)
+            fixes.append((title, old_line.strip(), lines[i].strip()))
+
+    if not fixes:
+        return date, [], ''
+    new_text = ''.join(lines)
+    diff = ''
+    if dry_run:
+        diff = ''.join(difflib.unified_diff(
+            text.splitlines(keepends=True), lines,
+            fromfile=f'a/{path.name}', tofile=f'b/{path.name}'))
+    else:
+        atomic_write_text(path, new_text)
+    return date, fixes, diff
+
+def main(dry_run=None):
+    if dry_run is None:
+        dry_run = DRY_RUN
+    total_fixes = 0
+    fix_details = []
+
+    # 本文に「読了」「読み終え」が一度も出てこない日記は修正しようがないので索引で除外
+    mentions = set(text_index.search('読了', scope='diary')) | set(text_index.search('読み終え', scope='diary'))
+    files = sorted(mentions)
+
+    try:
+        if len(files) >= POOL_THRESHOLD:
+            with ProcessPoolExecutor() as pool:
+                results = list(pool.map(fix_file, files, [dry_run] * len(files), chunksize=16))
+        else:
+            results = [fix_file(f, dry_run) for f in files]
+    except KeyboardInterrupt:
+        print("\n⚠️ 中断しました（書き換え済みのファイルはそのまま、途中のファイルは元のまま）")
+        return fix_details
+
+    for date, fixes, diff in results:
+        for title, old_line, new_line in fixes:
+            total_fixes += 1
+            fix_details.append((date, title))
+            print(f"  ✓ {date}: {title}")
+            print(f"    OLD: {old_line}")
+            print(f"    NEW: {new_line}")
+        if diff:
+            print(diff, end='' if diff.endswith('\n') else '\n')
+
+    print(f"\n合計: {total_fixes} 冊修正" + (" (DRY RUN)" if dry_run else ""))
     return fix_details
 
 if __name__ == '__main__':
@@ -0,0 +1,190 @@
+"""
+🚀 docs/ だけのデプロイ（git のプラミングコマンドで差分だけをコミットして push する）
+`git add .` でリポジトリ全体を見直す代わりに、docs/ のファイルの blob ハッシュ（git hash-object）を
+HEAD のツリーと比べ、変わったファイルだけをインデックスに載せて（update-index）コミットを作る。
+
+- 何も変わっていなければコミットしない（変更のない日のデプロイはコミット0件・push なし）
+- docs/ 以外の作業中の変更やステージ済みの変更はコミットに入らない（一時インデックスで HEAD + docs/ の差分を組む）
+- push するオブジェクトのサイズ（リモートにない分の圧縮後のバイト数）を表示する
+- remote はリモート名でもパスでもよい（ローカルの bare リポジトリに向けて試せる）
+
+  python git_deploy.py                       # origin の現在のブランチへ
+  python git_deploy.py --remote ../site.git  # ローカルの bare リポジトリへ
+  python git_deploy.py --branch gh-pages     # 今のブランチにコミットして、リモートの gh-pages へ push
+  python git_deploy.py --no-push             # コミットまで
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+SCRIPT_DIR = Path(__file__).parent
+DOCS_DIR = SCRIPT_DIR / "docs"
+ZERO = '0' * 40
+
+
+def git(repo: Path, *args, input: bytes | None = None, env: dict | None = None, check: bool = True) -> bytes:
+    """git を実行して標準出力を返す"""
+    r = subprocess.run(['git', '-C', str(repo), *args], input=input, capture_output=True,
+                       env={**os.environ, **env} if env else None)
+    if check and r.returncode != 0:
+        raise subprocess.CalledProcessError(r.returncode, ['git', *args], r.stdout, r.stderr)
+    return r.stdout
+
+
+def _text(out: bytes) -> str:
+    return out.decode('utf-8').strip()
+
+
+def head_files(repo: Path, prefix: str) -> dict[str, tuple[str, str]]:
+    """HEAD のツリーにある prefix 以下のファイル。{パス: (mode, blob)}（HEAD がなければ空）"""
+    if not git(repo, 'rev-parse', '--verify', '-q', 'HEAD', check=False):
+        return {}
+    files = {}
+    for rec in git(repo, 'ls-tree', '-r', '-z', 'HEAD', '--', prefix).split(b'\0'):
+        if rec:
+            meta, path = rec.split(b'\t', 1)
+            mode, _, sha = meta.decode().split()
+            files[path.decode('utf-8')] = (mode, sha)
+    return files
+
+
+def disk_files(repo: Path, prefix: str) -> list[str]:
+    """作業ツリーにある prefix 以下のファイル（.gitignore で除外されるものは除く）"""
+    out = git(repo, 'ls-files', '-z', '--cached', '--others', '--exclude-standard', '--', prefix)
+    paths = dict.fromkeys(p.decode('utf-8') for p in out.split(b'\0') if p)
+    return [p for p in paths if (repo / p).is_file()]
+
+
+def hash_objects(repo: Path, paths: list[str], write: bool = False) -> list[str]:
+    """git hash-object --stdin-paths（write=True ならオブジェクトも書く）"""
+    if not paths:
+        return []
+    args = ['hash-object', *(['-w'] if write else []), '--stdin-paths']
+    return _text(git(repo, *args, input='\n'.join(paths).encode('utf-8') + b'\n')).split('\n')
+
+
+def changed_files(repo: Path, prefix: str) -> tuple[dict[str, tuple[str, str]], list[str]]:
+    """(追加・変更されたファイル {パス: (mode, blob)}, 消えたファイル) — blob は書き込み済み"""
+    before = head_files(repo, prefix)
+    paths = disk_files(repo, prefix)
+    changed = [(p, sha) for p, sha in zip(paths, hash_objects(repo, paths))
+               if before.get(p, (None, None))[1] != sha]
+    # 変わったものだけオブジェクトを書く（同じハッシュになる）
+    written = hash_objects(repo, [p for p, _ in changed], write=True)
+    upsert = {p: (before.get(p, ('100644',))[0], sha) for (p, _), sha in zip(changed, written)}
+    removed = sorted(set(before) - set(paths))
+    return upsert, removed
+
+
+def _index_info(upsert: dict, removed: list) -> bytes:
+    """update-index -z --index-info の入力（mode 0 は削除）"""
+    recs = [f"{mode} {sha}\t{p}" for p, (mode, sha) in sorted(upsert.items())]
+    recs += [f"0 {ZERO}\t{p}" for p in removed]
+    return b''.join(r.encode('utf-8') + b'\0' for r in recs)
+
+
+def _remote_tip(repo: Path, remote: str, branch: str) -> str | None:
+    out = _text(git(repo, 'ls-remote', remote, f"refs/heads/{branch}"))
+    return out.split()[0] if out else None
+
+
+def pushed_bytes(repo: Path, commit: str, remote_tip: str | None) -> int:
+    """リモートにないオブジェクトの（圧縮後の）サイズ"""
+    exclude = []
+    if remote_tip:
+        try:
+            git(repo, 'cat-file', '-e', f"{remote_tip}^{{commit}}")
+            exclude = ['--not', remote_tip]
+        except subprocess.CalledProcessError:  # リモートにこちらの知らないコミットがある（push は拒否される）
+            pass
+    return int(_text(git(repo, 'rev-list', '--objects', '--disk-usage', commit, *exclude)) or 0)
+
+
+def deploy(repo: Path = SCRIPT_DIR, docs_dir: Path = DOCS_DIR, remote: str = 'origin',
+           branch: str | None = None, message: str | None = None, push: bool = True) -> dict:
+    """docs/ の差分だけをコミットして push する。
+
+    {'commit', 'added', 'modified', 'removed', 'push', 'pushed', 'bytes'} を返す。
+    コミットはいつも今のブランチ（detached なら HEAD）に積む。branch は push 先のブランチ名だけに使う
+    （既定は今のブランチ）。commit は作ったコミット（変更がなければ None）、bytes は push したオブジェクトのサイズ。
+    """
+    repo = Path(_text(git(Path(repo), 'rev-parse', '--show-toplevel')))
+    prefix = Path(docs_dir).resolve().relative_to(repo.resolve()).as_posix()
+    branch = branch or _text(git(repo, 'symbolic-ref', '-q', '--short', 'HEAD', check=False))
+    if push and not branch:
+        raise ValueError("HEAD が detached なので push 先のブランチを指定してください（--branch）")
+    parent = _text(git(repo, 'rev-parse', '--verify', '-q', 'HEAD', check=False)) or None
+
+    before = head_files(repo, prefix)
+    upsert, removed = changed_files(repo, prefix)
+    result = {'commit': None, 'added': sum(1 for p in upsert if p not in before),
+              'modified': sum(1 for p in upsert if p in before), 'removed': len(removed),
+              'push': push, 'pushed': False, 'bytes': 0}
+
+    if upsert or removed:
+        info = _index_info(upsert, removed)
+        # HEAD のツリー + docs/ の差分（ほかのステージ済みの変更は入れない）
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {'GIT_INDEX_FILE': str(Path(tmp) / 'index')}
+            git(repo, 'read-tree', *([parent] if parent else ['--empty']), env=env)
+            git(repo, 'update-index', '-z', '--index-info', input=info, env=env)
+            tree = _text(git(repo, 'write-tree', env=env))
+        message = message or f"update {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+        commit = _text(git(repo, 'commit-tree', tree, *(['-p', parent] if parent else []), '-m', message))
+        # HEAD（が指すブランチ）を進める。途中で HEAD が動いていたら失敗させる
+        git(repo, 'update-ref', '-m', f"deploy: {message}", 'HEAD', commit, parent or ZERO)
+        # いつものインデックスの docs/ も新しいコミットに合わせる（git status に差分が残らないように）
+        git(repo, 'update-index', '-z', '--index-info', input=info)
+        result['commit'] = commit
+
+    if push:
+        head = _text(git(repo, 'rev-parse', 'HEAD'))
+        tip = _remote_tip(repo, remote, branch)
+        if tip != head:
+            result['bytes'] = pushed_bytes(repo, head, tip)
+            git(repo, 'push', '-q', remote, f"{head}:refs/heads/{branch}")
+            result['pushed'] = True
+    return result
+
+
+def report(result: dict):
+    if result['commit'] is None:
+        print("   ＝ docs/ に変更なし（コミットしません）")
+    else:
+        print(f"   ✓ コミット {result['commit'][:10]}（追加 {result['added']} / 変更 {result['modified']} / 削除 {result['removed']}ファイル）")
+    if result['pushed']:
+        print(f"   📤 push: {result['bytes'] / 1024:.1f}KB")
+    elif result['push']:
+        print("   ＝ リモートは最新です（push しません）")
+    else:
+        print("   ⏸️ push していません")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="docs/ の差分だけをデプロイ")
+    parser.add_argument("--remote", default="origin", help="push 先（リモート名かリポジトリのパス）")
+    parser.add_argument("--branch", help="push 先のブランチ（既定: 現在のブランチ。コミットは現在のブランチに積む）")
+    parser.add_argument("--no-push", action="store_true", help="コミットだけして push しない")
+    args = parser.parse_args()
+
+    print("🚀 docs/ をデプロイ中...")
+    try:
+        result = deploy(remote=args.remote, branch=args.branch, push=not args.no_push)
+    except subprocess.CalledProcessError as e:
+        print(f"   ⚠️ デプロイ失敗: {' '.join(e.cmd)} — {e.stderr.decode('utf-8', 'replace').strip()}")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"   ⚠️ デプロイ失敗: {e}")
+        sys.exit(1)
+    report(result)
+
+
+if __name__ == "__main__":
+    main()
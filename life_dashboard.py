@@ -6,16 +6,33 @@ HTMLダッシュボード + Obsidianレポートを生成する
 使い方:
   python life_dashboard.py            # 生成のみ
   python life_dashboard.py --deploy   # 生成 + GitHub Pagesにデプロイ
+  python life_dashboard.py --serve    # 生成 + LANに配信（日記が変わったら作り直す）
 """
 
 import re
 import json
+import math
 import sys
 import os
-import subprocess
 import argparse
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date
+from itertools import accumulate
+
+import book_table
+import dashboard_server
+import git_deploy
+import mood_notes
+import template_render
+import wire_format
+from data_files import DataWriter
+from downsample import build_series
+from service_worker import write_service_worker
+import vendor_assets
+import page_build
+import svg_charts
+import sync_feed
+from link_graph import parse_reading
 
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
@@ -63,7 +80,7 @@ def parse_duration(s: str) -> float:
     return hours + mins / 60
 
 
-def parse_sleep_details(text: str) -> dict:
+def parse_sleep_details(text: str, mood: str | None = None) -> dict:
     d = {}
     m = re.search(r'睡眠スコア[：:]?\s*(\d+)', text)
     if m: d['score'] = int(m.group(1))
@@ -77,30 +94,25 @@ def parse_sleep_details(text: str) -> dict:
     m = re.search(r'覚醒\s*([\d時間分]+)', text)
     if m: d['awake'] = round(parse_duration(m.group(1)), 2)
 
+    # 時刻は "HH:MM" にそろえる（"7:30" も "07:30" に。列形式のシャードから同じ文字列に戻るように）
     m = re.search(r'就寝\s*(\d{1,2}:\d{2})\s*[〜~～]\s*起床\s*(\d{1,2}:\d{2})', text)
     if m:
-        d['bedtime'] = m.group(1)
-        d['waketime'] = m.group(2)
+        d['bedtime'] = m.group(1).zfill(5)
+        d['waketime'] = m.group(2).zfill(5)
     else:
         m = re.search(r'(\d{1,2}:\d{2})\s*[〜~～]\s*(\d{1,2}:\d{2})', text)
         if m:
-            d['bedtime'] = m.group(1)
-            d['waketime'] = m.group(2)
+            d['bedtime'] = m.group(1).zfill(5)
+            d['waketime'] = m.group(2).zfill(5)
 
     m = re.search(r'天気::(.+)', text)
     if m:
         weather = re.split(r'[。、\.!！]', m.group(1).strip())[0].strip()
         d['weather'] = weather
 
-    m = re.search(r'気分::(.+)', text, re.DOTALL)
-    if m:
-        # Get full mood text (multi-line until next section)
-        mood_raw = m.group(1).strip()
-        # Cut at next section header
-        cut = re.search(r'\n-\s+\S+::', mood_raw)
-        if cut:
-            mood_raw = mood_raw[:cut.start()].strip()
-        d['mood'] = mood_raw
+    # 気分メモはプレビューだけ（全文は mood_notes の置き場から読む）。mood は parse_mood 済みの全文
+    if mood:
+        d.update(mood_notes.preview(mood))
 
     m = re.search(r'歩数::\s*([\d,]+)\s*歩', text)
     if m: d['steps'] = int(m.group(1).replace(',', ''))
@@ -117,24 +129,6 @@ def parse_exercise(fm: dict) -> dict:
     return ex
 
 
-def parse_reading(text: str) -> list:
-    books = []
-    in_reading = False
-    for line in text.splitlines():
-        if '今日読んだ本' in line or '📚' in line:
-            in_reading = True
-            continue
-        if in_reading:
-            if line.strip().startswith('#') or (line.strip() and not line.strip().startswith('-')):
-                break
-            m = re.search(r'\[\[(.+?)(?:\|.+?)?\]\]', line)
-            if m:
-                title = m.group(1)
-                finished = '読了' in line
-                books.append({'title': title, 'finished': finished})
-    return books
-
-
 # === ジャンル分類 ===
 
 GENRE_RULES = [
@@ -206,27 +200,18 @@ def get_returned_titles() -> set:
         return set()
 
 
-def build_reading_summary(data: list[dict]) -> dict:
-    """全日記から読書サマリーを構築（ジャンル別・ペース分析）"""
+def build_reading_summary(data: list[dict], table=None) -> dict:
+    """全日記から読書サマリーを構築（ジャンル別・ペース分析）
+
+    table（book_table.BookTable）を渡すと、日記を集計し直さずに表から引く
+    """
+    if table is None:
+        table = book_table.BookTable.from_entries(data)
+
     book_tracker = {}  # title -> {first, last, finished, days_seen, genre}
-    
-    for entry in data:
-        date_str = entry['date']
-        for b in entry.get('books', []):
-            title = b['title']
-            if title not in book_tracker:
-                book_tracker[title] = {
-                    'title': title,
-                    'first': date_str,
-                    'last': date_str,
-                    'finished': None,
-                    'days_seen': 0,
-                    'genre': classify_genre(title),
-                }
-            book_tracker[title]['last'] = date_str
-            book_tracker[title]['days_seen'] += 1
-            if b.get('finished'):
-                book_tracker[title]['finished'] = date_str
+    for rec in table.records():
+        rec['genre'] = classify_genre(rec['title'])
+        book_tracker[rec['title']] = rec
     
     # 返却済み＆未読了の本を除外
     returned = get_returned_titles()
@@ -288,6 +273,8 @@ def build_reading_summary(data: list[dict]) -> dict:
     returned_count = sum(1 for b in book_tracker.values() if b.get('returned'))
     print(f"   📕 返却済み（未読了）除外: {returned_count}冊")
     
+    concurrency = build_concurrency(all_books)
+    
     return {
         'books': all_books,
         'genre_counts': genre_counts,
@@ -296,10 +283,132 @@ def build_reading_summary(data: list[dict]) -> dict:
         'avg_pace': round(avg_pace, 1),
         'total': len(all_books),
         'finished': sum(1 for b in all_books if b['finished']),
+        'concurrency': concurrency,
+        'day_count': sum(1 for e in data if e.get('books')),
     }
 
 
-def extract_all_data() -> list[dict]:
+def build_concurrency(books: list[dict]) -> dict:
+    """同時に読んでいた冊数（スイープライン）
+
+    各本を 初出日〜読了日（未読了なら最終日）の区間とみなし、開始(+1)/終了翌日(-1)の
+    イベントを1回だけソートして日ごとの冊数を出す。読了本ごとの平均並行数は
+    累積和から区間ごとにO(1)で引く（日ごとに本のリストをなめ直さない）。
+    各本に avg_concurrency を付け、ダッシュボード用のまとめを返す。
+    """
+    spans = []
+    events = []
+    for b in books:
+        start = date.fromisoformat(b['first']).toordinal()
+        end = max(start, date.fromisoformat(b['finished'] or b['last']).toordinal())
+        spans.append((start, end))
+        events.append((start, 1))
+        events.append((end + 1, -1))
+    if not events:
+        return {}
+    events.sort()
+
+    origin = events[0][0]
+    counts = [0] * (events[-1][0] - origin)
+    current, prev = 0, origin
+    for day, delta in events:
+        if day > prev:
+            counts[prev - origin:day - origin] = [current] * (day - prev)
+            prev = day
+        current += delta
+    prefix = list(accumulate(counts, initial=0))
+
+    # 平均並行数ごとの読了ペース（1冊 / 2冊 / 3冊 / 4冊以上）
+    levels = {}
+    for b, (start, end) in zip(books, spans):
+        if not b['finished']:
+            continue
+        avg_c = (prefix[end + 1 - origin] - prefix[start - origin]) / (end - start + 1)
+        b['avg_concurrency'] = round(avg_c, 2)
+        level = min(4, max(1, round(avg_c)))
+        levels.setdefault(level, []).append(b['reading_days'])
+
+    peak = max(counts)
+    active = [c for c in counts if c]
+    return {
+        'start': date.fromordinal(origin).isoformat(),
+        'counts': counts,
+        'peak': peak,
+        'peak_date': date.fromordinal(origin + counts.index(peak)).isoformat(),
+        'avg': round(sum(active) / len(active), 2) if active else 0,
+        'pace_by_level': [
+            {'level': f"{lv}冊" + ('以上' if lv == 4 else ''), 'books': len(days),
+             'avg_days': round(sum(days) / len(days), 1)}
+            for lv, days in sorted(levels.items())
+        ],
+    }
+
+
+def circular_mean_minutes(minutes: list[int]) -> int | None:
+    """時刻（0時からの分）の円周平均。23:30 と 0:30 の平均は 0:00（単純な平均だと 12:00 になる）"""
+    if not minutes:
+        return None
+    angles = [m / 1440 * 2 * math.pi for m in minutes]
+    mean = math.atan2(sum(map(math.sin, angles)), sum(map(math.cos, angles)))
+    return round(mean / (2 * math.pi) * 1440) % 1440
+
+
+def build_sleep_summary(data: list[dict], feed: dict | None = None) -> dict:
+    """睡眠アプリの月別・曜日別の集計（sleep.html に埋め込む列形式の表）
+
+    月は睡眠時間のある日だけで集計する（古い順）。曜日は日曜始まり（JSの getDay() と同じ）。
+    feed（sync_feed.write_feed の戻り値）のバージョンを載せておき、アプリはそれより新しい記録を
+    同期していたら最後の月だけをその場で集計し直す。
+    """
+    def bed_min(d):
+        h, m = map(int, d['bedtime'].split(':'))
+        return h * 60 + m
+
+    def stats(days):
+        scores = [d['score'] for d in days if d.get('score')]
+        return {
+            'days': len(days),
+            'hours': round(sum(d['hours'] for d in days) / len(days), 3) if days else None,
+            'score': round(sum(scores) / len(scores), 2) if scores else None,
+            'bed': circular_mean_minutes([bed_min(d) for d in days if d.get('bedtime')]),
+        }
+
+    by_month, by_dow = {}, [[] for _ in range(7)]
+    for d in sorted(data, key=lambda d: d['date']):
+        if not d.get('hours'):
+            continue
+        by_month.setdefault(d['date'][:7], []).append(d)
+        by_dow[(date.fromisoformat(d['date']).weekday() + 1) % 7].append(d)
+
+    months = {'month': [], 'days': [], 'hours': [], 'score': [], 'bed': [], 'under7': [], 'best': []}
+    for m, days in by_month.items():
+        st = stats(days)
+        best = days[0]
+        for d in days:
+            if (d.get('score') or 0) > (best.get('score') or 0):
+                best = d
+        for k in ('days', 'hours', 'score', 'bed'):
+            months[k].append(st[k])
+        months['month'].append(m)
+        months['under7'].append(sum(1 for d in days if d['hours'] < 7))
+        months['best'].append([best['date'], best.get('score')])
+
+    dow = {k: [] for k in ('days', 'hours', 'score', 'bed')}
+    for days in by_dow:
+        st = stats(days)
+        for k in dow:
+            dow[k].append(st[k])
+
+    return {
+        'feed': feed['feed'] if feed else None,
+        'version': feed['version'] if feed else 0,
+        'months': months,
+        'dow': dow,
+    }
+
+
+def extract_all_data(notes: dict | None = None) -> list[dict]:
+    """日記からレコードを作る。notes を渡すと気分メモの全文を {日付: 全文} で入れる（docs の notes 用）"""
     entries = []
     for f in sorted(DIARY_DIR.glob("*.md")):
         m = re.match(r'(\d{4}-\d{2}-\d{2})', f.stem)
@@ -319,8 +428,11 @@ def extract_all_data() -> list[dict]:
                 pass
 
         # Sleep details from body
-        details = parse_sleep_details(text)
-        entry.update(details)
+        # 気分メモは1回だけ読んで、プレビューと全文の両方に使う
+        mood = mood_notes.parse_mood(text)
+        entry.update(parse_sleep_details(text, mood))
+        if notes is not None and mood:
+            notes[date_str] = mood
 
         # Exercise from frontmatter
         exercise = parse_exercise(fm)
@@ -463,9 +575,12 @@ def generate_sleep_report(data: list[dict]) -> dict:
     return report
 
 
-def generate_obsidian_report(data: list[dict], report: dict) -> str:
-    """Obsidianマークダウンレポートを生成"""
+def generate_obsidian_report(data: list[dict], report: dict, daily: svg_charts.Daily | None = None) -> str:
+    """Obsidianマークダウンレポートを生成（グラフは日ごとの列 daily から作るSVG）"""
     today = datetime.now()
+    if daily is None:
+        daily = svg_charts.Daily(data)
+    recent = daily.window(today.date() - timedelta(days=29), today.date())
     week_num = today.isocalendar()[1]
     
     lines = [
@@ -494,6 +609,18 @@ def generate_obsidian_report(data: list[dict], report: dict) -> str:
             lines.append(f"- **ベスト**: {wk['best_day']}")
         lines.append("")
 
+    # 直近30日のグラフ
+    if any(h is not None for h in recent['hours']):
+        lines.append("## 📈 直近30日")
+        lines.append(f"睡眠時間 {svg_charts.bar_strip(recent['hours'], color=svg_charts.hours_color, hi=10, title='睡眠時間（直近30日）')}")
+        lines.append("")
+        if any(v is not None for v in recent['score']):
+            lines.append(f"スコア {svg_charts.sparkline(recent['score'], color=svg_charts.GREEN, fill=True, title='スコア（直近30日）')}")
+            lines.append("")
+        if any(v is not None for v in recent['bed']):
+            lines.append(f"就寝時刻 {svg_charts.sparkline(recent['bed'], invert=True, ref=24, title='就寝時刻（直近30日・破線は0時）')}")
+            lines.append("")
+
     # Monthly comparison
     mc = report.get('monthly_comparison', {})
     if mc:
@@ -521,19 +648,22 @@ def generate_obsidian_report(data: list[dict], report: dict) -> str:
         lines.append(f"- 7時間以上の連続日数: **{streaks['days_7h_plus']}日**")
         lines.append("")
 
+    # 1年分の睡眠時間
+    lines.append("## 🗓️ 過去1年の睡眠時間")
+    lines.append(svg_charts.year_heatmap(daily, 'hours', today.date(), (5, 6, 7, 8), title='睡眠時間（5h・6h・7h・8h以上で色が濃くなる）'))
+    lines.append("")
+
     lines.append(f"---")
     lines.append(f"*自動生成: {report.get('generated', '')}*")
     
     return "\n".join(lines)
 
 
-def main():
-    parser = argparse.ArgumentParser(description="総合ライフダッシュボード")
-    parser.add_argument("--deploy", action="store_true", help="GitHub Pagesにデプロイ")
-    args = parser.parse_args()
-
+def build() -> list[dict]:
+    """日記を読み込んでレポート・docs/ を生成する。パースしたデータを返す（--serve で配信する）"""
     print("📖 日記ファイルを読み込み中...")
-    data = extract_all_data()
+    notes = {}
+    data = extract_all_data(notes)
     
     has_sleep = [d for d in data if d.get('hours')]
     has_exercise = [d for d in data if d.get('exercise')]
@@ -566,72 +696,118 @@ def main():
             print(f"      - {imp}")
 
     # Generate Obsidian report
-    obsidian_md = generate_obsidian_report(data, report)
+    daily = svg_charts.Daily(data)  # レポートとダッシュボードの仮表示のSVGはこの列から描く
+    obsidian_md = generate_obsidian_report(data, report, daily)
     report_path = VAULT_DIR / f"睡眠レポート_{datetime.now().strftime('%Y-%m-%d')}.md"
     report_path.write_text(obsidian_md, encoding='utf-8')
     print(f"\n📝 Obsidianレポート: {report_path}")
 
     # Reading summary
-    reading_summary = build_reading_summary(data)
+    reading_summary = build_reading_summary(data, book_table.open_table())
     print(f"   📚 ジャンル別: {', '.join(f'{g}:{c}' for g,c in sorted(reading_summary['genre_counts'].items(), key=lambda x:-x[1]))}")
     print(f"   📖 平均読了ペース: {reading_summary['avg_pace']}日/冊")
+    conc = reading_summary['concurrency']
+    if conc:
+        print(f"   📚 並行読書: 平均{conc['avg']}冊 / 最大{conc['peak']}冊（{conc['peak_date']}）")
 
     # Generate HTML dashboard
     print("\n🎨 HTMLダッシュボード生成中...")
-    data_json = json.dumps(data, ensure_ascii=False)
-    report_json = json.dumps(report, ensure_ascii=False)
-    reading_json = json.dumps(reading_summary, ensure_ascii=False)
-    
     DOCS_DIR.mkdir(exist_ok=True)
+    writer = DataWriter(DOCS_DIR)
+    # 日ごとのデータは月ごとのシャード、レポートと読書サマリーは summary にまとめる
+    writer.write_months(data)
+    # 気分メモの全文は別のシャードに（日ごとのレコードにはプレビューだけ）
+    writer.write_notes(mood_notes.by_month(notes))
+    # 長い期間のグラフ用に、LTTBで間引いた系列も summary に載せる
+    series = build_series(data)
+    # 生成時刻は入れない（入れると記録が変わらなくても summary・latest.json・sw.js が毎回変わり、毎日デプロイのコミットができる）
+    docs_report = {k: v for k, v in report.items() if k != 'generated'}
+    writer.write('summary', wire_format.dumps({'report': docs_report, 'reading': reading_summary, 'series': series}))
+    # 睡眠アプリはスナップショット + 追記のみの差分フィード（data/sync.json）で同期する
+    feed = sync_feed.write_feed(writer, data)
     
-    # Read HTML template
+    # Render HTML template
+    # docs 版はデータを埋め込まず docs/data/ から fetch する。
+    # Vaultのローカル閲覧用（file://ではfetchできない）だけデータを埋め込む
     template_path = SCRIPT_DIR / "dashboard_template.html"
-    if template_path.exists():
-        html = template_path.read_text(encoding='utf-8')
-        html = html.replace('__DATA_JSON__', data_json)
-        html = html.replace('__REPORT_JSON__', report_json)
-        html = html.replace('__READING_JSON__', reading_json)
-    else:
+    if not template_path.exists():
         print(f"   ⚠️ テンプレートが見つかりません: {template_path}")
-        return
-
-    index_path = DOCS_DIR / "index.html"
-    index_path.write_text(html, encoding='utf-8')
-    print(f"   ✓ {index_path}")
-
-    # Also save to Vault for local viewing
+        return data
+    # Chart.js は docs/vendor/ に同梱したものを読む（Vault版は docs の外なのでCDNのまま）
+    print("\n📦 グラフライブラリ（docs/vendor/）:")
+    vendor = vendor_assets.vendor_assets(DOCS_DIR)
+    for line in vendor_assets.size_report(vendor):
+        print(f"   📏 {line}")
+    docs_scripts = vendor_assets.script_tags(r['src'] for r in vendor)
+    vault_scripts = vendor_assets.script_tags(vendor_assets.cdn_urls())
+
+    # テンプレートは minify して、docs 版は最初のタブ（睡眠）に要るCSSだけをインラインにする
+    pages = {'dashboard': page_build.build_page(template_path, 'dashboard', first_view=('renderSleep', 'initPeriods'))}
+    payload_json = json.dumps({'data': data, 'report': report, 'reading': reading_summary, 'series': series}, ensure_ascii=False)
     vault_html = VAULT_DIR / "睡眠ダッシュボード.html"
-    vault_html.write_text(html, encoding='utf-8')
-    print(f"   ✓ {vault_html}")
+    # Chart.js が描くまでの仮表示（睡眠タブの初期期間をSVGで描いておく。最後の記録の日までの期間）
+    placeholders = svg_charts.dashboard_placeholders(daily, daily.end)
+    template_render.report(template_render.render_parts(pages['dashboard']['docs'], {'PAYLOAD': 'null', 'VENDOR': docs_scripts, **placeholders}, [DOCS_DIR / "index.html"]))
+    template_render.report(template_render.render_parts(pages['dashboard']['standalone'], {'PAYLOAD': payload_json, 'VENDOR': vault_scripts, **placeholders}, [vault_html]))
 
-    # Generate Sleep App
+    # Generate Sleep App（データは差分フィード data/sync.json から IndexedDB に同期する）
     print("\n🌙 睡眠記録アプリ生成中...")
     sleep_template_path = SCRIPT_DIR / "sleep_template.html"
     if sleep_template_path.exists():
-        sleep_data = [d for d in data if d.get('hours') or d.get('score')]
-        sleep_json = json.dumps(sleep_data, ensure_ascii=False)
-        sleep_html = sleep_template_path.read_text(encoding='utf-8')
-        sleep_html = sleep_html.replace('__SLEEP_JSON__', sleep_json)
-        sleep_path = DOCS_DIR / "sleep.html"
-        sleep_path.write_text(sleep_html, encoding='utf-8')
-        print(f"   ✓ {sleep_path}")
+        pages['sleep'] = page_build.build_page(sleep_template_path, 'sleep', first_view=('renderHome',))
+        # 月別ページの集計はここで済ませてページに埋め込む（日ごとの記録は月を開いたときだけ使う）
+        sleep_summary = wire_format.dumps(build_sleep_summary(data, feed))
+        template_render.report(template_render.render_parts(pages['sleep']['docs'], {'SUMMARY': sleep_summary}, [DOCS_DIR / "sleep.html"]))
     else:
         print(f"   ⚠️ 睡眠テンプレートが見つかりません: {sleep_template_path}")
 
-    # Deploy
+    print("\n🗜️ minify（テンプレート → docs 版）:")
+    template_render.report(page_build.write_assets(DOCS_DIR, list(pages.values())))
+    for name, page in pages.items():
+        print(f"   📏 {page_build.size_report(name, page)}")
+
+    print(f"\n📦 データファイル（{len(writer.entries['months'])}か月分のシャード）:")
+    template_render.report(writer.finish(), quiet=True)
+    print(f"   📏 {writer.size_report()}")
+    if feed['reset']:
+        print(f"   🔄 睡眠アプリの差分フィード: 新規作成（v{feed['version']}・{feed['upserted']}日分）")
+    else:
+        print(f"   🔄 睡眠アプリの差分フィード: v{feed['version']}（追加・変更 {feed['upserted']}日 / 削除 {feed['deleted']}日）")
+
+    # Service Worker（書き出したページと、既定の期間のデータの precache マニフェスト入り）
+    print("\n📴 Service Worker 生成中...")
+    sw_template_path = SCRIPT_DIR / "sw_template.js"
+    if sw_template_path.exists():
+        template_render.report(write_service_worker(DOCS_DIR, sw_template_path, [*writer.precache_urls(daily.end), *(r['src'] for r in vendor if r['size'] is not None), *page_build.asset_urls(list(pages.values()))]))
+    else:
+        print(f"   ⚠️ Service Worker のテンプレートが見つかりません: {sw_template_path}")
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="総合ライフダッシュボード")
+    parser.add_argument("--deploy", action="store_true", help="GitHub Pagesにデプロイ")
+    parser.add_argument("--serve", action="store_true", help="docs/ と集計APIをローカルで配信する")
+    parser.add_argument("--host", default="0.0.0.0", help="配信するアドレス（既定: LAN全体）")
+    parser.add_argument("--port", type=int, default=8000, help="配信するポート")
+    args = parser.parse_args()
+
+    data = build()
+
+    # Deploy（docs/ の変わったファイルだけをコミットする。変更がなければコミットも push もしない）
     if args.deploy:
         print("\n🚀 GitHub Pagesにデプロイ中...")
         try:
-            subprocess.run(["git", "add", "."], cwd=str(SCRIPT_DIR), check=True)
-            subprocess.run(["git", "commit", "-m", f"update {datetime.now().strftime('%Y-%m-%d %H:%M')}"],
-                         cwd=str(SCRIPT_DIR), check=True)
-            subprocess.run(["git", "push"], cwd=str(SCRIPT_DIR), check=True)
-            print("   ✓ デプロイ完了！")
+            git_deploy.report(git_deploy.deploy(SCRIPT_DIR, DOCS_DIR))
         except Exception as e:
             print(f"   ⚠️ デプロイ失敗: {e}")
     
     print("\n✅ 完了！")
 
+    # Serve（Ctrl+C まで）
+    if args.serve:
+        dashboard_server.serve(DOCS_DIR, data, host=args.host, port=args.port, watch_dir=DIARY_DIR, rebuild=build)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,240 @@
+"""
+🔗 Vault全体のリンクグラフ
+日記・読書メモ・レポートなど、Vault内の全ノートの [[...]] を
+整数ノードIDと隣接配列で持つ（順方向リンク＋バックリンク）。
+
+- 「この本を読んだ日」「このノートにリンクしている日記」が次数分の参照で引ける
+- 日記の📚セクションの本（と読了マーク）もここで1回だけ抽出する。本の表（book_table）はこれを使う
+- 変更のあったノートだけ再抽出（mtime+サイズで判定）
+- グラフは .cache/link_graph.json に保存
+- [[...]] の抽出と📚セクションの判定はここに集約し、各スクリプトで共有する
+
+使い方:
+  python link_graph.py "教会堂の殺人 - 周木律"   # バックリンクと読んだ日
+"""
+import re
+import sys
+from array import array
+from pathlib import Path
+
+from vault_io import file_stamp, load_cache, save_cache
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+VAULT_DIR = Path(r"C:\Documents\Obsidian Vault\Main Vault")
+
+GRAPH_CACHE = "link_graph.json"
+GRAPH_VERSION = 2
+
+WIKILINK_RE = re.compile(r'\[\[(.+?)(?:\|.+?)?\]\]')
+
+# フォルダ名 → ノートの種類（それ以外は 'note'）
+KIND_DIRS = {'日記': 'diary', '📚_読書メモ': 'book'}
+
+
+# ─── リンク抽出（各スクリプト共通） ───
+
+def first_link(line: str) -> str | None:
+    """行の最初の [[...]] のリンク先（エイリアス部分は除く）"""
+    m = WIKILINK_RE.search(line)
+    return m.group(1) if m else None
+
+
+def iter_links(text: str):
+    """テキスト中の [[...]] のリンク先を順に返す"""
+    for m in WIKILINK_RE.finditer(text):
+        yield m.group(1)
+
+
+def reading_section(lines: list[str]) -> tuple[int | None, int | None]:
+    """📚セクション（今日読んだ本）の開始行と終了行（終了行は含まない）"""
+    start = None
+    for i, line in enumerate(lines):
+        if '今日読んだ本' in line or '📚' in line:
+            start = i
+            continue
+        if start is not None:
+            if line.strip().startswith('#') or (line.strip() and not line.strip().startswith('-')):
+                return start, i
+    if start is not None:
+        return start, len(lines)
+    return None, None
+
+
+def reading_lines(lines: list[str]) -> list[str]:
+    """📚セクション内の行（セクション見出しの行は除く）"""
+    start, end = reading_section(lines)
+    return [] if start is None else lines[start + 1:end]
+
+
+def parse_reading(text: str) -> list[dict]:
+    """日記の📚セクションの本。[{'title', 'finished'}, ...]（行の最初のリンク、読了は行に「読了」があるか）"""
+    books = []
+    for line in reading_lines(text.splitlines()):
+        title = first_link(line)
+        if title:
+            books.append({'title': note_name(title), 'finished': '読了' in line})
+    return books
+
+
+def note_name(target: str) -> str:
+    """リンク先をノード名にする（見出し・ブロック参照・パスを落とす）"""
+    target = re.split(r'[#^]', target, 1)[0].strip()
+    return target.rsplit('/', 1)[-1]
+
+
+def note_kind(path: Path) -> str:
+    try:
+        top = path.relative_to(VAULT_DIR).parts[0]
+    except (ValueError, IndexError):
+        return 'note'
+    return KIND_DIRS.get(top, 'note')
+
+
+# ─── グラフ ───
+
+class LinkGraph:
+    """ノード名 ↔ 整数ID と、ソースノートごとの隣接配列
+
+    sources[rel] = {'node': id, 'kind', 'stamp', 'links': [id...], 'reading': [id...], 'finished': [0/1...]}
+    reading は日記の📚セクションの本（parse_reading と同じ）、finished はそれぞれに読了マークがあるか。
+    バックリンクは読み込み時に組み立てる。
+    """
+
+    def __init__(self, nodes=None, sources=None):
+        self.nodes = list(nodes or [])
+        self.ids = {name: i for i, name in enumerate(self.nodes)}
+        self.sources = sources or {}
+        self._back = None
+        self._back_reading = None
+        self._source_of = None  # node id -> sourcesのキー
+
+    def node_id(self, name: str, create: bool = False) -> int | None:
+        i = self.ids.get(name)
+        if i is None and create:
+            i = len(self.nodes)
+            self.nodes.append(name)
+            self.ids[name] = i
+        return i
+
+    def set_source(self, rel: str, name: str, kind: str, text: str, stamp=None):
+        """1ノート分のリンクを抽出して隣接配列を置き換える"""
+        src = self.node_id(name, create=True)
+        links = [self.node_id(note_name(t), create=True) for t in iter_links(text)]
+        books = parse_reading(text) if kind == 'diary' else []
+        self.sources[rel] = {'node': src, 'kind': kind, 'stamp': stamp, 'links': links,
+                             'reading': [self.node_id(b['title'], create=True) for b in books],
+                             'finished': [int(b['finished']) for b in books]}
+        self._back = self._back_reading = None
+
+    def remove_source(self, rel: str):
+        if self.sources.pop(rel, None) is not None:
+            self._back = self._back_reading = None
+
+    def update(self) -> tuple[int, int]:
+        """Vaultを見て、変更・追加・削除されたノートだけ反映する"""
+        seen = set()
+        changed = 0
+        for f in VAULT_DIR.rglob('*.md'):
+            rel = f.relative_to(VAULT_DIR).as_posix()
+            if any(part.startswith('.') for part in rel.split('/')):
+                continue
+            seen.add(rel)
+            stamp = file_stamp(f)
+            old = self.sources.get(rel)
+            if old and old['stamp'] == stamp:
+                continue
+            self.set_source(rel, f.stem, note_kind(f), f.read_text(encoding='utf-8'), stamp)
+            changed += 1
+        removed = [rel for rel in self.sources if rel not in seen]
+        for rel in removed:
+            self.remove_source(rel)
+        return changed, len(removed)
+
+    def _build_back(self):
+        back = [array('i') for _ in self.nodes]
+        back_reading = [array('i') for _ in self.nodes]
+        self._source_of = {}
+        for rel, s in self.sources.items():
+            self._source_of[s['node']] = rel
+            for t in set(s['links']):
+                back[t].append(s['node'])
+            for t in set(s['reading']):
+                back_reading[t].append(s['node'])
+        for arr in back + back_reading:
+            arr[:] = array('i', sorted(arr))
+        self._back, self._back_reading = back, back_reading
+
+    # ─── 参照 ───
+
+    def links_from(self, name: str) -> list[str]:
+        """name のノートからのリンク先（重複なし・出現順）"""
+        src = self.node_id(note_name(name))
+        if self._back is None:
+            self._build_back()
+        rel = self._source_of.get(src)
+        if rel is None:
+            return []
+        return [self.nodes[i] for i in dict.fromkeys(self.sources[rel]['links'])]
+
+    def backlinks(self, name: str, kind: str | None = None) -> list[str]:
+        """name にリンクしているノート名（kind で 'diary' / 'book' / 'note' に絞れる）"""
+        i = self.node_id(note_name(name))
+        if i is None:
+            return []
+        if self._back is None:
+            self._build_back()
+        ids = self._back[i]
+        if kind is not None:
+            ids = [j for j in ids if self.sources[self._source_of[j]]['kind'] == kind]
+        return sorted(self.nodes[j] for j in ids)
+
+    def diaries(self):
+        """日記フォルダ直下の日記ごとに (ファイル名, stamp, [{'title', 'finished'}, ...])"""
+        for rel, s in self.sources.items():
+            parts = rel.split('/')
+            if s['kind'] == 'diary' and len(parts) == 2:
+                books = [{'title': self.nodes[i], 'finished': bool(f)} for i, f in zip(s['reading'], s['finished'])]
+                yield parts[1], s['stamp'], books
+
+    def reading_days(self, title: str) -> list[str]:
+        """📚セクションにその本が載っている日記（= 読んだ日）"""
+        i = self.node_id(note_name(title))
+        if i is None:
+            return []
+        if self._back_reading is None:
+            self._build_back()
+        return sorted(self.nodes[j] for j in self._back_reading[i])
+
+    # ─── 保存 ───
+
+    @classmethod
+    def load(cls) -> 'LinkGraph':
+        cache = load_cache(GRAPH_CACHE, GRAPH_VERSION)
+        return cls(cache.get('nodes'), cache.get('sources'))
+
+    def save(self):
+        save_cache(GRAPH_CACHE, GRAPH_VERSION, {'nodes': self.nodes, 'sources': self.sources})
+
+
+def open_graph() -> LinkGraph:
+    """保存済みのグラフを読み込み、ノートの変更分だけ反映して返す"""
+    graph = LinkGraph.load()
+    changed, removed = graph.update()
+    if changed or removed:
+        graph.save()
+    print(f"   🔗 リンクグラフ: {len(graph.sources)}ノート / {len(graph.nodes)}ノード（更新{changed} / 削除{removed}）")
+    return graph
+
+
+if __name__ == "__main__":
+    graph = open_graph()
+    for name in sys.argv[1:]:
+        print(f"\n🔗 {name}")
+        days = graph.reading_days(name)
+        print(f"   📚 読んだ日 ({len(days)}日): {', '.join(days)}")
+        for kind, label in [('diary', '📅 日記'), ('book', '📖 読書メモ'), ('note', '📝 その他')]:
+            names = graph.backlinks(name, kind)
+            if names:
+                print(f"   {label} ({len(names)}): {', '.join(names)}")
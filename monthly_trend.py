@@ -9,7 +9,7 @@
 import sys
 sys.stdout.reconfigure(encoding='utf-8')
 
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from collections import defaultdict
 
@@ -18,6 +18,8 @@ VAULT_DIR = Path(r"C:\Documents\Obsidian Vault\Main Vault")
 
 sys.path.insert(0, str(SCRIPT_DIR))
 import life_dashboard as ld
+import svg_charts
+from book_table import BookTable, open_table
 
 
 def delta_str(current, previous, unit='', higher_is_better=True, is_pct=False):
@@ -47,8 +49,8 @@ def delta_str(current, previous, unit='', higher_is_better=True, is_pct=False):
         return f"**{current}{unit}** {color}{arrow} {sign}{diff:.1f}{unit}（{sign}{pct:.0f}%）"
 
 
-def compute_month_stats(data, year_month):
-    """指定月のデータを集計"""
+def compute_month_stats(data, year_month, table=None):
+    """指定月のデータを集計（読書は本の表から引く）"""
     month_data = [d for d in data if d['date'][:7] == year_month]
     if not month_data:
         return None
@@ -75,13 +77,11 @@ def compute_month_stats(data, year_month):
     avg_steps = sum(d['steps'] for d in step_days) / len(step_days) if step_days else 0
     
     # 読書
-    books_touched = set()
-    finished_titles = []
-    for d in month_data:
-        for b in d.get('books', []):
-            books_touched.add(b['title'])
-            if b.get('finished'):
-                finished_titles.append(b['title'].split(' - ')[0])
+    if table is None:
+        table = BookTable.from_entries(month_data)
+    start, end = f"{year_month}-01", f"{year_month}-31"
+    books_touched = table.touched_between(start, end)
+    finished_titles = [t.split(' - ')[0] for t in table.finished_between(start, end)]
     
     return {
         'month': year_month,
@@ -110,8 +110,22 @@ def compute_month_stats(data, year_month):
     }
 
 
-def generate_trend_report(data, target_month=None):
-    """月次トレンドレポートを生成"""
+def month_charts(daily, year_month):
+    """その月の日ごとのグラフ（1日1要素のSVG）"""
+    first = date.fromisoformat(f"{year_month}-01")
+    last = (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    w = daily.window(first, last)
+    size = {'width': 310, 'height': 48}
+    return {
+        'hours': svg_charts.bar_strip(w['hours'], color=svg_charts.hours_color, hi=10, title=f'睡眠時間（{year_month}）', **size),
+        'score': svg_charts.sparkline(w['score'], color=svg_charts.GREEN, fill=True, title=f'スコア（{year_month}）', **size),
+        'exercise': svg_charts.bar_strip(w['exercise'], width=size['width'], height=12, hi=1, title=f'筋トレ（{year_month}）'),
+        'steps': svg_charts.bar_strip(w['steps'], color=svg_charts.CYAN, title=f'歩数（{year_month}）', **size),
+    }
+
+
+def generate_trend_report(data, target_month=None, table=None, daily=None):
+    """月次トレンドレポートを生成（daily は svg_charts.Daily。なければ data から作る）"""
     # 全月を取得
     all_months = sorted(set(d['date'][:7] for d in data))
     
@@ -123,8 +137,10 @@ def generate_trend_report(data, target_month=None):
         print(f"⚠️ {target_month} のデータがありません")
         return None, None
     
-    current = compute_month_stats(data, target_month)
-    previous = compute_month_stats(data, all_months[idx - 1]) if idx > 0 else None
+    if table is None:
+        table = BookTable.from_entries(data)
+    current = compute_month_stats(data, target_month, table)
+    previous = compute_month_stats(data, all_months[idx - 1], table) if idx > 0 else None
     
     if not current:
         print(f"⚠️ {target_month} のデータがありません")
@@ -136,6 +152,7 @@ def generate_trend_report(data, target_month=None):
     ce, pe = c['exercise'], p['exercise'] if p else {}
     cst, pst = c['steps'], p['steps'] if p else {}
     cr, pr = c['reading'], p['reading'] if p else {}
+    charts = month_charts(daily or svg_charts.Daily(data), target_month)
     
     # ─── Obsidianレポート ───
     md = f"""---
@@ -171,12 +188,16 @@ month: {target_month}
     md += row('7h以上達成率', cs['days_7h_pct'], ps.get('days_7h_pct'), '%')
     if cs['avg_deep']:
         md += row('平均深い睡眠', cs['avg_deep'], ps.get('avg_deep'), 'h')
+    md += f"\n睡眠時間 {charts['hours']}\n"
+    if cs['avg_score']:
+        md += f"\nスコア {charts['score']}\n"
     
     # 運動
     md += "\n## 💪 運動\n\n"
     md += "| 指標 | 今月 | 前月 | 変化 |\n|------|------|------|------|\n"
     md += row('筋トレ日数', ce['days'], pe.get('days'), '日')
     md += row('実施率', ce['rate'], pe.get('rate'), '%')
+    md += f"\n{charts['exercise']}\n"
     
     # 歩数
     md += "\n## 🚶 歩数\n\n"
@@ -194,6 +215,7 @@ month: {target_month}
     else:
         change_s = '—'
     md += f"| 平均歩数 | **{avg_s:,}歩** | {prev_s}歩 | {change_s} |\n"
+    md += f"\n{charts['steps']}\n"
     
     # 読書
     md += "\n## 📚 読書\n\n"
@@ -245,7 +267,7 @@ def main():
     print("📈 月次トレンド比較レポート生成中...")
     data = ld.extract_all_data()
     
-    md, current = generate_trend_report(data, target)
+    md, current = generate_trend_report(data, target, open_table())
     if not md:
         return
     
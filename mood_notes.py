@@ -0,0 +1,74 @@
+"""
+💭 気分メモ（日記の「気分::」の自由記述）の置き場
+気分メモは何行にもなる自由記述なので、日ごとのレコード（分析・ダッシュボード・睡眠アプリに流れるもの）には
+短いプレビューだけを載せ、全文は日付をキーにした別の置き場から必要なときだけ読む。
+
+- レコード: 'mood' = プレビュー（改行は空白にして PREVIEW 文字まで）
+            'mood_len' = 全文の文字数（プレビューが全文と違うときだけ。あれば全文は置き場にある）
+- Python: MoodNotes(DIARY_DIR).get('2026-02-14') がその日の日記だけを読み直して全文を返す
+- docs: data/notes-YYYY-MM.<hash>.json（{日付: 全文}）を latest.json の notes に載せる。
+  ページは全文を出すときにその月の分だけを fetch する（precache はしない）
+"""
+import re
+from pathlib import Path
+
+PREVIEW = 40
+
+MOOD_RE = re.compile(r'気分::(.+)', re.DOTALL)
+# 次の項目（「- 歩数::」など）の手前まで
+NEXT_FIELD_RE = re.compile(r'\n-\s+\S+::')
+
+
+def parse_mood(text: str) -> str | None:
+    """日記の本文から気分メモの全文（複数行）"""
+    m = MOOD_RE.search(text)
+    if not m:
+        return None
+    mood = m.group(1).strip()
+    cut = NEXT_FIELD_RE.search(mood)
+    if cut:
+        mood = mood[:cut.start()].strip()
+    return mood
+
+
+def preview(mood: str) -> dict:
+    """レコードに載せる {'mood': プレビュー}（全文と違えば 'mood_len' も）"""
+    short = ' '.join(mood.split())
+    if len(short) > PREVIEW:
+        short = short[:PREVIEW - 1] + '…'
+    return {'mood': short} if short == mood else {'mood': short, 'mood_len': len(mood)}
+
+
+def by_month(notes: dict[str, str]) -> dict[str, dict[str, str]]:
+    """{日付: 全文} を {'YYYY-MM': {日付: 全文}} に分ける（data/notes-YYYY-MM のシャード用）"""
+    months = {}
+    for d, mood in sorted(notes.items()):
+        months.setdefault(d[:7], {})[d] = mood
+    return months
+
+
+class MoodNotes:
+    """日付 -> 気分メモの全文。聞かれた日の日記だけを読む（読んだ分は覚えておく）"""
+
+    def __init__(self, diary_dir: Path):
+        self.dir = Path(diary_dir)
+        self._paths = None
+        self._cache = {}
+
+    def _path(self, date_str: str) -> Path | None:
+        if self._paths is None:
+            self._paths = {}
+            for f in sorted(self.dir.glob("*.md")):
+                m = re.match(r'(\d{4}-\d{2}-\d{2})', f.stem)
+                if m:
+                    self._paths.setdefault(m.group(1), f)
+        return self._paths.get(date_str)
+
+    def get(self, date_str: str) -> str | None:
+        if date_str not in self._cache:
+            path = self._path(date_str)
+            try:
+                self._cache[date_str] = parse_mood(path.read_text(encoding='utf-8')) if path else None
+            except OSError:
+                self._cache[date_str] = None
+        return self._cache[date_str]
@@ -0,0 +1,354 @@
+"""
+🗜️ ページの軽量化（minify と クリティカルCSS）
+テンプレートのインラインCSSとHTMLを Python だけで minify し、
+CSSは「最初の画面で使うルールだけ」をインラインに、全体はハッシュ付きの外部ファイル
+（docs/assets/dashboard.1a2b3c4d5e.css）にする。
+
+- minify するのは CSS と HTML のコメント・空白だけ。JS はテンプレートのまま出す
+  （自動セミコロン挿入に頼っている書き方なので、手書きの minify で意味が変わる危険を取らない）
+- クリティカルCSS = 最初の画面（非表示のタブ/ページを除いたマークアップ + 最初に描画する関数のJS）に
+  出てくるクラス名・IDだけで成り立つセレクタのルール
+- 外部CSSは全ルールを元の順番のまま持つ。後から読み込まれてインラインの分を上書きするので、
+  カスケードの結果は元のテンプレートと同じ（描画をブロックしない読み込み + noscript）
+- Vault版（file://）は外部ファイルを読めないので、CSSを全部インラインにした版を使う
+"""
+import hashlib
+import re
+from pathlib import Path
+
+import template_render
+from template_render import write_if_changed
+from vault_io import file_stamp
+
+ASSETS_DIRNAME = "assets"
+HASH_LEN = 10
+
+# name.<hash>.css
+HASHED_RE = re.compile(r'^.+\.[0-9a-f]{%d}\.css$' % HASH_LEN)
+
+# 最初は非表示のセクション（active が付いていないもの）
+HIDDEN_SECTION_RE = re.compile(r'<div\b[^>]*\bclass="(?![^"]*\bactive\b)[^"]*(?<![\w-])(?:tab-content|page)(?![\w-])[^"]*"[^>]*>')
+
+# テンプレートのパス → (stamp, first_view, ビルド結果)
+_builds: dict[str, tuple] = {}
+
+
+# ===== JS =====
+# JS は minify しない。クリティカルCSSのために関数の範囲（{ ... }）を取るときだけ読み飛ばしに使う
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c in '_$'
+
+
+def _skip_string(src: str, i: int) -> int:
+    """src[i] の引用符で始まる文字列の終わりの次の位置"""
+    q = src[i]
+    i += 1
+    while i < len(src):
+        c = src[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == q or c == '\n':
+            return i + 1
+        i += 1
+    return i
+
+
+def _skip_regex(src: str, i: int) -> int:
+    """src[i] の / で始まる正規表現リテラル（フラグ込み）の終わりの次の位置"""
+    i += 1
+    in_class = False
+    while i < len(src):
+        c = src[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '\n':
+            return i
+        if in_class:
+            in_class = c != ']'
+        elif c == '[':
+            in_class = True
+        elif c == '/':
+            i += 1
+            break
+        i += 1
+    while i < len(src) and _is_word_char(src[i]):
+        i += 1
+    return i
+
+
+def _skip_braces(src: str, i: int) -> int:
+    """${ の直後（i）から対応する } の次の位置まで（中の文字列・テンプレート・正規表現は読み飛ばす）"""
+    depth = 1
+    last = '{'
+    while i < len(src):
+        c = src[i]
+        if c in '"\'':
+            i = _skip_string(src, i)
+            last = '"'
+            continue
+        if c == '`':
+            i = _skip_template(src, i)
+            last = '`'
+            continue
+        if c == '/' and last and last[-1] in '(,=:[!&|?{};':
+            i = _skip_regex(src, i)
+            last = '"'
+            continue
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+            if not depth:
+                return i + 1
+        if not c.isspace():
+            last = c
+        i += 1
+    return i
+
+
+def _skip_template(src: str, i: int) -> int:
+    """src[i] の ` で始まるテンプレートリテラルの終わりの次の位置"""
+    i += 1
+    while i < len(src):
+        c = src[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '`':
+            return i + 1
+        if c == '$' and src.startswith('{', i + 1):
+            i = _skip_braces(src, i + 2)
+            continue
+        i += 1
+    return i
+
+
+# ===== CSS =====
+
+CSS_DROP_SPACE = set('{};,>:(')
+CSS_DROP_SPACE_BEFORE = set('{};,>)')
+
+
+def minify_css(css: str) -> str:
+    """CSSのコメントと余分な空白を消す（文字列の中はそのまま）"""
+    out = []
+    i, n = 0, len(css)
+    space = False
+    while i < n:
+        c = css[i]
+        if css.startswith('/*', i):
+            j = css.find('*/', i + 2)
+            i = n if j < 0 else j + 2
+            space = True
+            continue
+        if c.isspace():
+            space = True
+            i += 1
+            continue
+        if c in '"\'':
+            j = _skip_string(css, i)
+            tok = css[i:j]
+        else:
+            j = i + 1
+            tok = c
+        if space and out and out[-1][-1] not in CSS_DROP_SPACE and tok[0] not in CSS_DROP_SPACE_BEFORE:
+            out.append(' ')
+        if tok == '}' and out and out[-1] == ';':
+            out.pop()
+        out.append(tok)
+        space = False
+        i = j
+    return ''.join(out)
+
+
+def _css_blocks(css: str) -> list:
+    """minify 済みCSSをトップレベルのブロックに分ける: [(プレリュード, 本体 or [入れ子のブロック])]"""
+    blocks = []
+    i, n = 0, len(css)
+    while i < n:
+        j = css.find('{', i)
+        if j < 0:
+            break
+        prelude = css[i:j]
+        depth, k = 1, j + 1
+        while k < n and depth:
+            if css[k] in '"\'':
+                k = _skip_string(css, k)
+                continue
+            depth += {'{': 1, '}': -1}.get(css[k], 0)
+            k += 1
+        body = css[j + 1:k - 1]
+        if prelude.startswith('@media') or prelude.startswith('@supports'):
+            blocks.append((prelude, _css_blocks(body)))
+        else:
+            blocks.append((prelude, body))
+        i = k
+    return blocks
+
+
+def _selector_used(selector: str, names: set) -> bool:
+    """セレクタに出てくるクラス名・IDがすべて names にあるか（:not() の中は見ない）"""
+    selector = re.sub(r':not\([^)]*\)', '', selector)
+    return all(name in names for name in re.findall(r'[.#]([\w-]+)', selector))
+
+
+def critical_css(css: str, names: set) -> str:
+    """names（最初の画面に出てくるクラス名・ID）で使うルールだけを残したCSS"""
+    def keep(blocks):
+        out = []
+        for prelude, body in blocks:
+            if isinstance(body, list):
+                inner = keep(body)
+                if inner:
+                    out.append(f"{prelude}{{{inner}}}")
+            elif prelude.startswith('@') or any(_selector_used(s, names) for s in prelude.split(',')):
+                out.append(f"{prelude}{{{body}}}")
+        return ''.join(out)
+    return keep(_css_blocks(css))
+
+
+# ===== HTML =====
+
+SEGMENT_RE = re.compile(r'(<script\b[^>]*>)(.*?)(</script>)|(<style\b[^>]*>)(.*?)(</style>)|(<!--(?!\[).*?-->)', re.S)
+
+
+def _minify_markup(html: str) -> str:
+    """タグの間のインデントと空行を消す（改行は残すので表示上の空白は変わらない）"""
+    return '\n'.join(line.strip() for line in html.split('\n') if line.strip())
+
+
+def _first_view_markup(markup: str) -> str:
+    """非表示のタブ/ページの <div> を丸ごと除いたマークアップ"""
+    while True:
+        m = HIDDEN_SECTION_RE.search(markup)
+        if not m:
+            return markup
+        depth, pos = 1, m.end()
+        for t in re.finditer(r'<div\b|</div>', markup[pos:]):
+            depth += 1 if t.group() != '</div>' else -1
+            if not depth:
+                pos += t.end()
+                break
+        else:
+            pos = len(markup)
+        markup = markup[:m.start()] + markup[pos:]
+
+
+def _function_source(js: str, name: str) -> str:
+    """JSから function name(...) { ... } の部分を取り出す（なければ空文字）"""
+    m = re.search(r'function\s+%s\s*\(' % re.escape(name), js)
+    if not m:
+        return ''
+    start = js.find('{', m.end())
+    return js[m.start():_skip_braces(js, start + 1)]
+
+
+def _class_names(text: str) -> set:
+    """マークアップ/JS に出てくるクラス名・IDらしき単語"""
+    names = set()
+    for m in re.finditer(r'\b(?:class|id)="([^"]*)"|class(?:Name|List\.\w+)\s*(?:=|\()\s*([^;\n]*)', text):
+        names.update(re.findall(r'[\w-]+', m.group(1) or m.group(2)))
+    return names
+
+
+def _split_html(text: str):
+    """(マークアップ, [(開始タグ, 中身, 終了タグ, 種類)]) に分ける。マークアップ側は \\0 で位置を残す"""
+    blocks = []
+
+    def repl(m):
+        if m.group(7):
+            return ''
+        if m.group(1):
+            blocks.append((m.group(1), m.group(2), m.group(3), 'script'))
+        else:
+            blocks.append((m.group(4), m.group(5), m.group(6), 'style'))
+        return '\0'
+    return SEGMENT_RE.sub(repl, text), blocks
+
+
+def build_page(template_path: Path, name: str, first_view=()) -> dict:
+    """テンプレートのCSS・HTMLを minify し、docs 版とスタンドアロン版の断片を作る（テンプレートが変わらなければキャッシュ）
+
+    {'docs': parts, 'standalone': parts, 'css_name', 'css', 'sizes': {...}} を返す。
+    parts は template_render.render_parts にそのまま渡せる。first_view は最初の画面を描くJS関数の名前。
+    """
+    key = str(template_path)
+    stamp = file_stamp(template_path)
+    cached = _builds.get(key)
+    if cached and cached[0] == stamp and cached[1] == (name, tuple(first_view)):
+        return cached[2]
+
+    text = template_path.read_text(encoding='utf-8')
+    markup, blocks = _split_html(text)
+    scripts = ''.join(body for _, body, _, kind in blocks if kind == 'script')
+    names = _class_names(_first_view_markup(markup))
+    for fn in first_view:
+        names |= _class_names(_function_source(scripts, fn))
+
+    css = minify_css(''.join(body for _, body, _, kind in blocks if kind == 'style'))
+    critical = critical_css(css, names)
+    css_bytes = css.encode('utf-8')
+    css_name = f"{name}.{hashlib.sha256(css_bytes).hexdigest()[:HASH_LEN]}.css"
+    href = f"{ASSETS_DIRNAME}/{css_name}"
+    css_link = (f'<link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+                f'<noscript><link rel="stylesheet" href="{href}"></noscript>')
+
+    def assemble(style_html):
+        pieces = iter(blocks)
+        out = []
+        for i, part in enumerate(_minify_markup(markup).split('\0')):
+            out.append(part)
+            if i < len(blocks):
+                start, body, end, kind = next(pieces)
+                if kind == 'style':
+                    out.append(style_html)
+                else:
+                    out.append(f"{start}{body}{end}")
+        return ''.join(out)
+
+    docs_html = assemble(f"<style>{critical}</style>{css_link}")
+    standalone_html = assemble(f"<style>{css}</style>")
+    result = {
+        'docs': template_render.split_template(docs_html),
+        'standalone': template_render.split_template(standalone_html),
+        'css_name': css_name,
+        'css': css_bytes,
+        'sizes': {
+            'template': len(text.encode('utf-8')),
+            'docs': len(docs_html.encode('utf-8')),
+            'standalone': len(standalone_html.encode('utf-8')),
+            'css_before': len(''.join(body for _, body, _, kind in blocks if kind == 'style').encode('utf-8')),
+            'css': len(css_bytes),
+            'critical': len(critical.encode('utf-8')),
+        },
+    }
+    _builds[key] = (stamp, (name, tuple(first_view)), result)
+    return result
+
+
+def write_assets(docs_dir: Path, pages: list[dict]) -> dict[Path, bool]:
+    """ページのCSSを docs/assets/ に書き、使われなくなった古いCSSを消す"""
+    out_dir = Path(docs_dir) / ASSETS_DIRNAME
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = {out_dir / p['css_name']: write_if_changed(out_dir / p['css_name'], [p['css']]) for p in pages}
+    keep = {p['css_name'] for p in pages}
+    for f in out_dir.iterdir():
+        if HASHED_RE.match(f.name) and f.name not in keep:
+            f.unlink()
+    return written
+
+
+def asset_urls(pages: list[dict]) -> list[str]:
+    return [f"{ASSETS_DIRNAME}/{p['css_name']}" for p in pages]
+
+
+def size_report(name: str, page: dict) -> str:
+    def kb(n):
+        return f"{n / 1024:.1f}KB"
+    s = page['sizes']
+    return (f"{name}: {kb(s['template'])} → {kb(s['docs'])}（-{1 - s['docs'] / s['template']:.0%}）"
+            f" / CSS {kb(s['css_before'])} → {kb(s['css'])}（インライン {kb(s['critical'])}）")
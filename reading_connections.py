@@ -10,12 +10,94 @@ sys.stdout.reconfigure(encoding='utf-8')
 
 from pathlib import Path
 from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import re, yaml
 
+from author_graph import author_clusters
+from text_index import NgramIndex
+from vault_io import file_stamp, load_cache, save_cache
+
 VAULT_DIR = Path(r"C:\Documents\Obsidian Vault\Main Vault")
 BOOK_DIR = VAULT_DIR / "📚_読書メモ"
 
+# パース済みノートのキャッシュ（ファイルのmtime+サイズで判定）
+BOOK_CACHE = "book_cache.json"
+BOOK_CACHE_VERSION = 1
+# これ以上の冊数を再解析するときだけプロセスプールを使う
+POOL_THRESHOLD = 32
+
+# C実装のYAMLローダーがあれば使う（純Python版はかなり遅い）
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+FM_KEYS = ('author', 'category', '読了日')
+DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+
+def _simple_scalar(val):
+    """YAMLと同じ結果になると言い切れる単純な値だけ返す（判断できなければ例外）"""
+    if not val:
+        return None
+    if val[0] in '[{&*!|>%@`' or ' #' in val:
+        raise ValueError(val)
+    if len(val) >= 2 and val[0] == val[-1] == '"' and '\\' not in val and '"' not in val[1:-1]:
+        return val[1:-1]
+    if len(val) >= 2 and val[0] == val[-1] == "'" and "'" not in val[1:-1]:
+        return val[1:-1]
+    if val[0] in '"\'' or ': ' in val or val.endswith(':'):
+        raise ValueError(val)
+    if DATE_RE.fullmatch(val):
+        return val
+    # ASCIIだけの値は数値・真偽値などに化ける可能性があるのでYAMLに任せる
+    if val.isascii():
+        raise ValueError(val)
+    return val
+
+
+def parse_simple_frontmatter(block):
+    """author / category / 読了日 だけを手書きパーサーで読む
+
+    単純な「key: 値」と「- 項目」のリストだけに対応し、
+    それ以外の書き方が出てきたら None を返してYAMLローダーに任せる。
+    """
+    fm = {}
+    current = None
+    try:
+        for line in block.splitlines():
+            if not line.strip():
+                continue
+            if line[0] in ' -':
+                item = line.strip()
+                if current is None:
+                    continue
+                if item != '-' and not item.startswith('- '):
+                    return None
+                if not isinstance(fm[current], list):
+                    if fm[current] is not None:
+                        return None
+                    fm[current] = []
+                fm[current].append(_simple_scalar(item[1:].strip()))
+                continue
+            if line[0] == '\t':
+                return None
+            key, sep, val = line.partition(':')
+            if not sep or (val and val[0] != ' '):
+                return None
+            key = key.strip()
+            if key[:1] in ('"', "'", '?'):
+                return None
+            if key in FM_KEYS:
+                fm[key] = _simple_scalar(val.strip())
+                current = key
+            else:
+                # 値の中の「: 」はYAMLでは構文エラーになるので判定を任せる
+                if ': ' in val.strip() and val.strip()[:1] not in '"\'[{':
+                    return None
+                current = None
+    except ValueError:
+        return None
+    return fm
+
 
 def parse_book(filepath):
     """1冊の読書ノートをパースして辞書を返す"""
@@ -36,7 +118,9 @@ def parse_book(filepath):
     fm_match = re.match(r'^---\n(.*?)\n---', text, re.DOTALL)
     if fm_match:
         try:
-            fm = yaml.safe_load(fm_match.group(1))
+            fm = parse_simple_frontmatter(fm_match.group(1))
+            if fm is None:
+                fm = yaml.load(fm_match.group(1), Loader=YAML_LOADER)
             authors = fm.get('author', [])
             if isinstance(authors, list):
                 book['author'] = ', '.join(str(a) for a in authors if a)
@@ -75,6 +159,38 @@ def parse_book(filepath):
     return book
 
 
+def load_books(files):
+    """読書ノートをまとめてパース（変更のないノートはキャッシュから復元）
+
+    キャッシュが古い・無いノートが多いときはプロセスプールで並列に解析する。
+    """
+    cache = load_cache(BOOK_CACHE, BOOK_CACHE_VERSION).get('files', {})
+    entries = {}
+    stale = []
+    for f in files:
+        stamp = file_stamp(f)
+        hit = cache.get(f.name)
+        if hit and hit['stamp'] == stamp:
+            entries[f.name] = hit
+        else:
+            stale.append((f, stamp))
+
+    if stale:
+        paths = [f for f, _ in stale]
+        if len(stale) >= POOL_THRESHOLD:
+            with ProcessPoolExecutor() as pool:
+                parsed = list(pool.map(parse_book, paths, chunksize=8))
+        else:
+            parsed = [parse_book(f) for f in paths]
+        for (f, stamp), book in zip(stale, parsed):
+            book = {k: v for k, v in book.items() if k != 'file'}
+            entries[f.name] = {'stamp': stamp, 'book': book}
+        save_cache(BOOK_CACHE, BOOK_CACHE_VERSION, {'files': entries})
+
+    print(f"  ♻️ キャッシュ: {len(files) - len(stale)}冊 / 再解析: {len(stale)}冊")
+    return [dict(entries[f.name]['book'], file=f) for f in files]
+
+
 # テーマキーワード辞書（日本語 → テーマ）
 THEME_KEYWORDS = {
     '睡眠': ['睡眠', '眠', '不眠', '就寝', '覚醒', '安眠', '目覚め', '夜中'],
@@ -104,24 +220,39 @@ def find_themes(text):
     return found
 
 
+def find_themes_all(texts):
+    """複数テキストのテーマをまとめて検出（find_themes と同じ結果）
+
+    各テキストをbigram索引に載せ、キーワードごとにポスティングリストを引いて
+    ヒットした文書だけに加点する。全文を キーワード数 × 冊数 回なめ直さない。
+    """
+    index = NgramIndex()
+    for i, text in enumerate(texts):
+        index.add(i, text)
+    scores = [Counter() for _ in texts]
+    for theme, keywords in THEME_KEYWORDS.items():
+        for kw in keywords:
+            for i in index.search(kw, texts.__getitem__):
+                scores[i][theme] += 1
+    results = []
+    for sc in scores:
+        found = [(theme, score) for theme, score in sc.items() if score >= 2]
+        found.sort(key=lambda x: -x[1])
+        results.append(found)
+    return results
+
+
 def analyze():
     print("📖 読書知識連結分析中...\n")
     
-    files = sorted(BOOK_DIR.glob('*.md'))
-    books = []
-    for f in files:
-        if f.name.startswith('00_'):
-            continue
-        b = parse_book(f)
-        if b['all_text'].strip():
-            books.append(b)
+    files = [f for f in sorted(BOOK_DIR.glob('*.md')) if not f.name.startswith('00_')]
+    books = [b for b in load_books(files) if b['all_text'].strip()]
     
     print(f"  📚 分析対象: {len(books)}冊（コンテンツあり）\n")
     
     # ─── 1. テーマ分析 ───
     theme_books = defaultdict(list)
-    for b in books:
-        themes = find_themes(b['all_text'])
+    for b, themes in zip(books, find_themes_all([b['all_text'] for b in books])):
         b['themes'] = themes
         for theme, score in themes:
             theme_books[theme].append((b, score))
@@ -149,6 +280,9 @@ def analyze():
     
     multi_book_authors = {a: bks for a, bks in author_books.items() if len(bks) >= 3}
     
+    # 著者–テーマ/カテゴリのグラフからクラスターを求める（1冊だけの著者も含む）
+    author_net = author_clusters(books)
+    
     # ─── 4. 時系列テーマ変遷 ───
     monthly_themes = defaultdict(lambda: Counter())
     for b in books:
@@ -223,6 +357,19 @@ generated: {datetime.now().strftime('%Y-%m-%d')}
             md += f"読んだ本: {', '.join(b['title'][:25] for b in auth_books[:5])}\n\n"
             print(f"    {author}: {len(auth_books)}冊 → {', '.join(top_themes[:2]) if top_themes else '-'}")
     
+    # Author clusters
+    if author_net['clusters']:
+        md += "\n## 🧩 著者クラスター\n\n"
+        md += (f"> {author_net['authors']}人の著者を、共通するテーマ・カテゴリ・共著でつないだグラフ"
+               f"（{author_net['edges']}辺 / 連結成分{author_net['components']}）から見つけたグループ\n\n")
+        print(f"\n  🧩 著者クラスター: {len(author_net['clusters'])}個（著者{author_net['authors']}人 / 連結成分{author_net['components']}）")
+        for i, c in enumerate(author_net['clusters'][:8], 1):
+            names = ', '.join(c['authors'][:6]) + (f" ほか{len(c['authors']) - 6}人" if len(c['authors']) > 6 else '')
+            md += f"### クラスター{i}（{len(c['authors'])}人・{c['books']}冊）\n\n"
+            md += f"共通点: {', '.join(c['features']) if c['features'] else '（共著のみ）'}\n\n"
+            md += f"著者: {names}\n\n"
+            print(f"    {i}. {len(c['authors'])}人・{c['books']}冊 → {', '.join(c['features'][:2])}")
+    
     # Monthly theme evolution
     if monthly_themes:
         md += "\n## 📅 テーマの時系列変遷\n\n"
@@ -1,7 +1,8 @@
 """月次振り返り用データ抽出"""
 import sys
 sys.stdout.reconfigure(encoding='utf-8')
-from life_dashboard import extract_all_data, generate_sleep_report
+from life_dashboard import DIARY_DIR, extract_all_data, generate_sleep_report
+from mood_notes import MoodNotes
 
 data = extract_all_data()
 
@@ -45,8 +46,9 @@ show_month("2月 (途中)", feb)
 show_month("1月", jan)
 
 print("\n=== 気分メモ（2月直近7日） ===")
+notes = MoodNotes(DIARY_DIR)  # レコードにはプレビューしかないので、全文はその日の日記から読む
 for d in sorted(feb, key=lambda x: x['date'], reverse=True)[:7]:
-    mood = d.get('mood', '')
+    mood = notes.get(d['date']) if d.get('mood') else ''
     date = d['date']
     if mood:
         short = mood[:120].replace('\n', ' ')
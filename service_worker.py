@@ -0,0 +1,47 @@
+"""
+📴 Service Worker の生成
+docs/ に書き出したページとデータファイルから precache のマニフェストを作り、
+sw_template.js に埋め込んで docs/sw.js を書く。
+
+- ページ（HTML・Webアプリのmanifest）と latest.json は中身のハッシュを revision に載せる
+- data/・vendor/・assets/ のハッシュ付きファイルは名前にハッシュが入っているので revision なし（ずっとキャッシュしてよい）。
+  data/ の月のシャードは既定の期間の分だけ渡される（DataWriter.precache_urls。ほかは表示したときに cache-first で取る）
+- VERSION はマニフェスト全体のハッシュ。何か1つでも変わればキャッシュ名が変わり、
+  古いバージョンのキャッシュは activate で消える（ハッシュ付きファイルは前のキャッシュからコピーする）
+- 何も変わらなければ sw.js も同じ中身のまま（ブラウザはSWを更新しない）
+"""
+import hashlib
+import json
+from pathlib import Path
+
+import template_render
+from data_files import DATA_DIRNAME, LATEST
+
+SW_NAME = "sw.js"
+# docs 直下で precache するファイル（あるものだけ）
+PAGES = ('index.html', 'sleep.html', 'manifest.json', 'sleep-manifest.json')
+
+
+def _file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:10]
+
+
+def precache_manifest(docs_dir: Path, hashed_urls) -> list[dict]:
+    """[{'url', 'revision'}, ...]（hashed_urls はハッシュ付きファイルの docs からの相対URL）"""
+    docs_dir = Path(docs_dir)
+    entries = [{'url': name, 'revision': _file_hash(docs_dir / name)}
+               for name in PAGES if (docs_dir / name).exists()]
+    latest = f"{DATA_DIRNAME}/{LATEST}"
+    if (docs_dir / latest).exists():
+        entries.append({'url': latest, 'revision': _file_hash(docs_dir / latest)})
+    entries += [{'url': url, 'revision': None} for url in sorted(set(hashed_urls))]
+    return entries
+
+
+def write_service_worker(docs_dir: Path, template_path: Path, hashed_urls) -> dict[Path, bool]:
+    """docs/sw.js を書く（中身が変わらなければ書かない）。{パス: 書き込んだか} を返す"""
+    manifest = precache_manifest(docs_dir, hashed_urls)
+    manifest_json = json.dumps(manifest, ensure_ascii=False, separators=(',', ':'))
+    version = hashlib.sha256(manifest_json.encode('utf-8')).hexdigest()[:10]
+    values = {'VERSION': json.dumps(version), 'PRECACHE': manifest_json}
+    return template_render.render(template_path, values, [Path(docs_dir) / SW_NAME])
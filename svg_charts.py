@@ -0,0 +1,173 @@
+"""
+🖼️ 静的SVGのミニグラフ（スパークライン・棒の帯・1年のヒートマップ）
+パース済みのデータを1回だけ走査して日ごとの列を作り、そこから期間を切り出してSVGの文字列にする。
+
+- Obsidianのレポート（Markdown）には <svg> をそのまま1行で埋め込む（読み取りビューで表示される）
+- ダッシュボードでは Chart.js が読み込まれて描画するまでの仮表示にする（描いたら消す）
+- 外部ライブラリは使わない。色はダッシュボードのグラフと揃える
+"""
+from datetime import date, timedelta
+from html import escape
+
+# ダッシュボードと同じ色
+BLUE, AMBER, RED = 'rgba(79,143,255,.5)', 'rgba(245,158,11,.5)', 'rgba(239,68,68,.5)'
+GREEN, PURPLE, CYAN = '#22c55e', '#8b5cf6', '#06b6d4'
+MUTED = '#555577'
+# ヒートマップの5段階（0 = 記録なし）
+HEAT = ('#1f1f35', '#3b2f6b', '#5b45a8', '#7c5ce0', '#a78bfa')
+
+
+def bed_hour(t: str | None) -> float | None:
+    """就寝時刻 'HH:MM' を時間に（正午前は +24。ダッシュボードの tDec と同じ）"""
+    if not t:
+        return None
+    h, m = map(int, t.split(':'))
+    return (h + 24 if h < 12 else h) + m / 60
+
+
+def hours_color(h: float) -> str:
+    """睡眠時間の棒の色（7h以上・6h以上・それ未満）"""
+    return BLUE if h >= 7 else AMBER if h >= 6 else RED
+
+
+# 列: 名前 -> レコードから値を取る関数（なければ None）
+COLUMNS = {
+    'hours': lambda d: d.get('hours'),
+    'score': lambda d: d.get('score'),
+    'deep': lambda d: d.get('deep'),
+    'bed': lambda d: bed_hour(d.get('bedtime')),
+    'steps': lambda d: d.get('steps'),
+    'exercise': lambda d: 1 if d.get('exercise') else 0,
+}
+
+
+class Daily:
+    """最初の日から最後の日まで1日1要素の列（記録のない日は None）"""
+
+    def __init__(self, data: list[dict]):
+        days = sorted(data, key=lambda d: d['date'])
+        self.start = date.fromisoformat(days[0]['date']) if days else date.today()
+        n = (date.fromisoformat(days[-1]['date']) - self.start).days + 1 if days else 0
+        self.end = self.start + timedelta(days=n - 1)  # 最後の記録の日
+        self.columns = {k: [None] * n for k in COLUMNS}
+        for d in days:
+            i = (date.fromisoformat(d['date']) - self.start).days
+            for k, f in COLUMNS.items():
+                self.columns[k][i] = f(d)
+
+    def window(self, first: date, last: date) -> dict[str, list]:
+        """first〜last（両端含む）の列。範囲外の日は None で埋める"""
+        lo = (first - self.start).days
+        hi = (last - self.start).days + 1
+        return {k: [col[i] if 0 <= i < len(col) else None for i in range(lo, hi)]
+                for k, col in self.columns.items()}
+
+
+def _num(x: float) -> str:
+    return f"{x:.1f}".rstrip('0').rstrip('.')
+
+
+def _svg(width: int, height: int, body: list[str], title: str) -> str:
+    label = f'<title>{escape(title)}</title>' if title else ''
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" '
+            f'width="{width}" height="{height}" role="img" aria-label="{escape(title)}">{label}{"".join(body)}</svg>')
+
+
+def _range(values, lo, hi):
+    vals = [v for v in values if v is not None]
+    lo = min(vals) if lo is None else min(lo, *vals)
+    hi = max(vals) if hi is None else max(hi, *vals)
+    return lo, (hi if hi > lo else lo + 1)
+
+
+def sparkline(values: list, width: int = 240, height: int = 48, color: str = PURPLE,
+              fill: bool = False, ref: float | None = None, lo: float | None = None, hi: float | None = None,
+              invert: bool = False, title: str = '') -> str:
+    """折れ線（None のところで線を切る）。ref は破線の目安線、invert は上下反転（就寝時刻用）"""
+    pad = 3
+    if not any(v is not None for v in values):
+        return _svg(width, height, [], title)
+    lo, hi = _range(values, lo, hi)
+    step = (width - 2 * pad) / max(len(values) - 1, 1)
+
+    def y(v):
+        r = (v - lo) / (hi - lo)
+        return pad + (r if invert else 1 - r) * (height - 2 * pad)
+
+    segments, cur = [], []
+    for i, v in enumerate(values):
+        if v is None:
+            if cur:
+                segments.append(cur)
+            cur = []
+        else:
+            cur.append((pad + i * step, y(v)))
+    if cur:
+        segments.append(cur)
+
+    body = []
+    if ref is not None and lo <= ref <= hi:
+        ry = _num(y(ref))
+        body.append(f'<line x1="0" y1="{ry}" x2="{width}" y2="{ry}" stroke="{MUTED}" stroke-dasharray="3 3"/>')
+    for seg in segments:
+        pts = ' '.join(f"{_num(x)},{_num(yy)}" for x, yy in seg)
+        if fill and len(seg) > 1:
+            base = _num(height - pad if not invert else pad)
+            body.append(f'<polygon points="{_num(seg[0][0])},{base} {pts} {_num(seg[-1][0])},{base}" fill="{color}" fill-opacity=".12"/>')
+        if len(seg) > 1:
+            body.append(f'<polyline points="{pts}" fill="none" stroke="{color}" stroke-width="1.5" stroke-linejoin="round"/>')
+        else:
+            body.append(f'<circle cx="{_num(seg[0][0])}" cy="{_num(seg[0][1])}" r="1.5" fill="{color}"/>')
+    lx, ly = segments[-1][-1]
+    body.append(f'<circle cx="{_num(lx)}" cy="{_num(ly)}" r="2.5" fill="{color}"/>')
+    return _svg(width, height, body, title)
+
+
+def bar_strip(values: list, width: int = 240, height: int = 48, color=PURPLE,
+              lo: float = 0, hi: float | None = None, title: str = '') -> str:
+    """1要素1本の棒。color は色の文字列か、値から色を返す関数"""
+    if not any(v is not None for v in values):
+        return _svg(width, height, [], title)
+    lo, hi = _range(values, lo, hi)
+    slot = width / max(len(values), 1)
+    bar = max(slot * .7, 1)
+    body = []
+    for i, v in enumerate(values):
+        if v is None or v <= lo:
+            continue
+        h = (min(v, hi) - lo) / (hi - lo) * height
+        fill = color(v) if callable(color) else color
+        body.append(f'<rect x="{_num(i * slot + (slot - bar) / 2)}" y="{_num(height - h)}" '
+                    f'width="{_num(bar)}" height="{_num(h)}" rx="1" fill="{fill}"/>')
+    return _svg(width, height, body, title)
+
+
+def year_heatmap(daily: Daily, column: str, last: date, levels: tuple, cell: int = 10,
+                 title: str = '') -> str:
+    """last までの53週分のヒートマップ（列が週、行が月曜〜日曜）。levels は段階の下限（昇順）"""
+    first = last - timedelta(days=last.weekday() + 52 * 7)
+    values = daily.window(first, last)[column]
+    gap = 2
+    # 段階ごとに1つの path にまとめる（1日1要素にすると1年分で数十KBになる）
+    paths = [[] for _ in HEAT]
+    for i, v in enumerate(values):
+        level = 0 if v is None else min(1 + sum(1 for t in levels if v >= t), len(HEAT) - 1)
+        paths[level].append(f"M{(i // 7) * (cell + gap)} {(i % 7) * (cell + gap)}h{cell}v{cell}h-{cell}z")
+    body = [f'<path d="{"".join(p)}" fill="{HEAT[level]}"/>' for level, p in enumerate(paths) if p]
+    return _svg(53 * (cell + gap) - gap, 7 * (cell + gap) - gap, body, title)
+
+
+def dashboard_placeholders(daily: Daily, last: date, days: int = 30) -> dict[str, str]:
+    """ダッシュボードの睡眠タブ（初期表示の期間）の仮表示。テンプレートのプレースホルダー名 -> SVG
+
+    last は期間の最後の日。最後の記録の日を渡す（今日にすると記録が変わらなくても index.html が毎日変わる）
+
+    テンプレート側で <div class="ph"> に入れる（クラス名がテンプレートにあるので最初の画面のCSSに残る）
+    """
+    w = daily.window(last - timedelta(days=days), last)
+    size = {'width': 600, 'height': 300}
+    return {
+        'PHHOURS': bar_strip(w['hours'], color=hours_color, hi=10, title='睡眠時間', **size),
+        'PHSCORE': sparkline(w['score'], color=GREEN, fill=True, lo=70, hi=100, title='スコア', **size),
+        'PHBED': sparkline(w['bed'], color=PURPLE, lo=21, hi=26, invert=True, title='就寝時刻', **size),
+    }
@@ -0,0 +1,83 @@
+// Service Worker（life_dashboard.py が sw_template.js から生成する。docs/sw.js を直接編集しないこと）
+// VERSION は precache マニフェストのハッシュ。ページやデータが変わるとバージョンが変わり、古いキャッシュは activate で消える
+const VERSION = __VERSION_JSON__;
+const PRECACHE = __PRECACHE_JSON__;  // [{ url, revision }]（revision が null のものはURL自体にハッシュが入っている）
+const PREFIX = 'life-dashboard-';
+const CACHE = PREFIX + VERSION;
+const CDN_CACHE = PREFIX + 'cdn';  // バージョン固定のCDNスクリプトとWebフォント（URLが変わらない限り使い回す）
+const CDN_HOSTS = new Set(['cdn.jsdelivr.net', 'fonts.googleapis.com', 'fonts.gstatic.com']);
+const HASHED_RE = /\.[0-9a-f]{10}\.(?:json|js|css)$/;  // data/・vendor/・assets/ のハッシュ付きファイル
+const NETWORK_FIRST = new Set(['data/latest.json', 'data/sync.json']);  // 固定名のマニフェスト（毎回取り直す）
+
+const scope = new URL(self.registration.scope);
+const abs = u => new URL(u, scope).href;
+
+// インストール: ハッシュ付きファイルは前のバージョンのキャッシュにあればコピーし、なければ取得する
+self.addEventListener('install', e => {
+  e.waitUntil((async () => {
+    const cache = await caches.open(CACHE);
+    await Promise.all(PRECACHE.map(async ({ url, revision }) => {
+      if (!revision) {
+        const hit = await caches.match(abs(url));
+        if (hit) return cache.put(abs(url), hit);
+      }
+      const r = await fetch(abs(url), { cache: 'reload' });
+      if (r.ok) await cache.put(abs(url), r);
+    }));
+    self.skipWaiting();
+  })());
+});
+
+// 有効化: このバージョンとCDN以外の life-dashboard-* キャッシュを消す
+self.addEventListener('activate', e => {
+  e.waitUntil((async () => {
+    const keys = await caches.keys();
+    await Promise.all(keys.filter(k => k.startsWith(PREFIX) && k !== CACHE && k !== CDN_CACHE).map(k => caches.delete(k)));
+    await self.clients.claim();
+  })());
+});
+
+async function cacheFirst(req, cacheName) {
+  const hit = await caches.match(req);
+  if (hit) return hit;
+  const r = await fetch(req);
+  if (r.ok || r.type === 'opaque') (await caches.open(cacheName)).put(req, r.clone());
+  return r;
+}
+
+async function networkFirst(req) {
+  try {
+    const r = await fetch(req);
+    if (r.ok) (await caches.open(CACHE)).put(req.url, r.clone());
+    return r;
+  } catch (err) {
+    const hit = await caches.match(req.url);
+    if (hit) return hit;
+    throw err;
+  }
+}
+
+// キャッシュがあればすぐ返し、裏で取り直してキャッシュを更新する
+function staleWhileRevalidate(e, key) {
+  const update = fetch(e.request).then(async r => {
+    if (r.ok) await (await caches.open(CACHE)).put(key, r.clone());
+    return r;
+  });
+  e.waitUntil(update.catch(() => { }));
+  return caches.match(key).then(hit => hit || update);
+}
+
+self.addEventListener('fetch', e => {
+  const req = e.request;
+  if (req.method !== 'GET') return;
+  const url = new URL(req.url);
+  if (url.origin !== scope.origin) {
+    if (CDN_HOSTS.has(url.hostname)) e.respondWith(cacheFirst(req, CDN_CACHE));
+    return;
+  }
+  if (!url.href.startsWith(scope.href)) return;
+  const path = url.pathname.slice(scope.pathname.length);
+  if (NETWORK_FIRST.has(path)) e.respondWith(networkFirst(req));
+  else if (HASHED_RE.test(path)) e.respondWith(cacheFirst(req, CACHE));
+  else e.respondWith(staleWhileRevalidate(e, abs(path === '' || path.endsWith('/') ? path + 'index.html' : path)));
+});
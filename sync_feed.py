@@ -0,0 +1,82 @@
+"""
+🔄 睡眠記録アプリの差分フィード（docs/data/sync.json）
+睡眠アプリは記録を IndexedDB に保存しておき、開いたときは小さな sync.json だけを取りに行く。
+前回の同期より新しいバージョンがあれば、その間の差分（追加・変更された日と消えた日）だけを取得する。
+
+  sync.json = {
+    "feed": "1a2b3c4d",                  # フィードのID（作り直したら変わる → アプリはスナップショットから取り直す）
+    "version": 42,                       # ビルドで記録が変わるたびに +1
+    "snapshot": "data/snapshot.<hash>.json",   # version 時点の全記録（列形式）
+    "deltas": ["<hash>", ...]            # version-len+1 〜 version の差分（data/delta-<version>.<hash>.json）
+  }
+
+- 差分は追記のみ。前のビルドの状態は docs/ にある前回のスナップショットから読む（.cache が消えても続く）
+- 記録が変わらないビルドではバージョンも sync.json も変わらない
+- 差分は直近 KEEP 個だけ残す。それより古いバージョンのアプリ（初回も）はスナップショットを丸ごと取る
+- 睡眠アプリが使う項目だけを載せる（睡眠時間かスコアがある日）
+"""
+import json
+from pathlib import Path
+
+import wire_format
+from data_files import DATA_DIRNAME, DataWriter, content_hash
+from template_render import write_if_changed
+
+SYNC = "sync.json"
+KEEP = 14
+FIELDS = ('hours', 'score', 'deep', 'light', 'rem', 'awake', 'bedtime', 'waketime', 'weather', 'mood', 'mood_len')
+
+
+def sleep_rows(entries: list[dict]) -> list[dict]:
+    """睡眠アプリに載せるレコード（日付順）"""
+    rows = [{'date': e['date'], **{k: e[k] for k in FIELDS if k in e}}
+            for e in entries if e.get('hours') or e.get('score')]
+    return sorted(rows, key=lambda r: r['date'])
+
+
+def _read_previous(writer: DataWriter) -> tuple[dict | None, dict]:
+    """(前回の sync.json, 前回のスナップショットの {日付: レコード})。読めなければ (None, {})"""
+    try:
+        prev = json.loads((writer.dir / SYNC).read_text(encoding='utf-8'))
+        snapshot = json.loads((writer.dir.parent / prev['snapshot']).read_text(encoding='utf-8'))
+        return prev, {r['date']: r for r in wire_format.decode_rows(snapshot)}
+    except (OSError, ValueError, KeyError):
+        return None, {}
+
+
+def write_feed(writer: DataWriter, entries: list[dict]) -> dict:
+    """スナップショットと差分を書き、sync.json を更新する。
+
+    {'feed', 'version', 'upserted', 'deleted', 'reset'} を返す（reset はフィードを作り直したか）。
+    書いたファイルは writer.written に入る。
+    """
+    rows = sleep_rows(entries)
+    current = {r['date']: r for r in rows}
+    prev, before = _read_previous(writer)
+
+    snapshot_json = wire_format.dumps(wire_format.encode_rows(rows))
+    if prev is None:
+        # 初回（か前回のフィードが読めない）: 差分なしで作り直す
+        feed = content_hash(snapshot_json.encode('utf-8'))[:8]
+        version, deltas = 1, []
+        upserted, deleted = rows, []
+    else:
+        feed, version, deltas = prev['feed'], prev['version'], list(prev['deltas'])
+        upserted = [r for r in rows if before.get(r['date']) != r]
+        deleted = sorted(d for d in before if d not in current)
+        if upserted or deleted:
+            version += 1
+            delta = {'version': version, 'upsert': wire_format.encode_rows(upserted), 'delete': deleted}
+            url = writer.write_side(f"delta-{version}", wire_format.dumps(delta))
+            deltas.append(Path(url).name.split('.')[1])
+            deltas = deltas[-KEEP:]
+
+    # 残す差分のファイル（前のビルドで書いたもの）は消さない
+    for i, h in enumerate(deltas):
+        writer.side.add(f"{DATA_DIRNAME}/delta-{version - len(deltas) + 1 + i}.{h}.json")
+    snapshot_url = writer.write_side('snapshot', snapshot_json)
+
+    sync = {'feed': feed, 'version': version, 'snapshot': snapshot_url, 'deltas': deltas}
+    path = writer.dir / SYNC
+    writer.written[path] = write_if_changed(path, [wire_format.dumps(sync).encode('utf-8')])
+    return {'feed': feed, 'version': version, 'upserted': len(upserted), 'deleted': len(deleted), 'reset': prev is None}
@@ -0,0 +1,122 @@
+"""
+🧩 テンプレート描画
+HTMLテンプレートを __XXX_JSON__ / __XXX_HTML__ のプレースホルダーで一度だけ分割してキャッシュし、
+断片と値（JSON・HTMLの断片）を順に出力ファイルへ流し込む。
+
+- 文字列全体の replace を繰り返さない（ドキュメント全体のコピーが発生しない）
+- 中身のハッシュが既存ファイルと同じなら書き込まない
+  （不要な git の差分や Obsidian Sync の転送を出さない）
+- 書き込みは一時ファイル→rename（途中で中断しても壊れたHTMLが残らない）
+- 改行は変換せずテンプレートのまま（LF）で書く
+"""
+import hashlib
+import re
+from pathlib import Path
+
+from vault_io import atomic_write_bytes, file_stamp
+
+PLACEHOLDER_RE = re.compile(r'__([A-Z]+)_(?:JSON|HTML)__')
+CHUNK = 1 << 16
+
+# テンプレートのパス → (stamp, 断片のリスト)
+_templates: dict[str, tuple[list[int], list]] = {}
+
+
+def load_template(path: Path) -> list:
+    """テンプレートを [bytes, 'NAME', bytes, 'NAME', ..., bytes] に分割して返す（変更がなければキャッシュ）"""
+    key = str(path)
+    stamp = file_stamp(path)
+    cached = _templates.get(key)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    parts = split_template(path.read_text(encoding='utf-8'))
+    _templates[key] = (stamp, parts)
+    return parts
+
+
+def split_template(text: str) -> list:
+    """テキストをプレースホルダーの位置で [bytes, 'NAME', ..., bytes] に分割する"""
+    parts = []
+    pos = 0
+    for m in PLACEHOLDER_RE.finditer(text):
+        parts.append(text[pos:m.start()].encode('utf-8'))
+        parts.append(m.group(1))
+        pos = m.end()
+    parts.append(text[pos:].encode('utf-8'))
+    return parts
+
+
+def render_chunks(parts: list, values: dict) -> list[bytes]:
+    """断片とプレースホルダーの値（文字列）を出力順のバイト列にする"""
+    encoded = {name: v.encode('utf-8') for name, v in values.items()}
+    chunks = []
+    for i, part in enumerate(parts):
+        if i % 2:
+            if part not in encoded:
+                raise KeyError(f"テンプレートのプレースホルダー {part} に渡す値がありません")
+            chunks.append(encoded[part])
+        else:
+            chunks.append(part)
+    return chunks
+
+
+def _digest_chunks(chunks) -> tuple[str, int]:
+    h = hashlib.sha256()
+    size = 0
+    for c in chunks:
+        h.update(c)
+        size += len(c)
+    return h.hexdigest(), size
+
+
+def _digest_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def same_content(path: Path, digest: str, size: int) -> bool:
+    """既存ファイルの中身が digest/size と一致するか（サイズが違えば読まずに判定）"""
+    try:
+        if path.stat().st_size != size:
+            return False
+    except OSError:
+        return False
+    return _digest_file(path) == digest
+
+
+def write_if_changed(path: Path, chunks) -> bool:
+    """中身が既存ファイルと違うときだけ書く。書いたら True"""
+    chunks = list(chunks)
+    digest, size = _digest_chunks(chunks)
+    if same_content(path, digest, size):
+        return False
+    atomic_write_bytes(path, chunks)
+    return True
+
+
+def render(template_path: Path, values: dict, outputs: list[Path]) -> dict[Path, bool]:
+    """テンプレートを描画して各出力先に書く。{出力先: 書き込んだか} を返す"""
+    return render_parts(load_template(template_path), values, outputs)
+
+
+def render_parts(parts: list, values: dict, outputs: list[Path]) -> dict[Path, bool]:
+    """分割済みのテンプレートを描画して各出力先に書く"""
+    chunks = render_chunks(parts, values)
+    return {Path(out): write_if_changed(Path(out), chunks) for out in outputs}
+
+
+def report(written: dict[Path, bool], quiet: bool = False):
+    """書き込み結果を表示する（quiet なら変更のなかったファイルは件数だけ）"""
+    unchanged = 0
+    for path, changed in written.items():
+        if changed:
+            print(f"   ✓ {path}")
+        elif quiet:
+            unchanged += 1
+        else:
+            print(f"   ＝ {path}（変更なし）")
+    if unchanged:
+        print(f"   ＝ 変更なし: {unchanged}件")
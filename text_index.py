@@ -0,0 +1,245 @@
+"""
+🔎 全文n-gramインデックス
+日記と📚_読書メモのノートを文字bigram（＋1文字）で転置索引にし、
+部分一致検索をポスティングリストの積集合で済ませる。
+日本語は単語の区切りがないので、形態素ではなくbigramを単位にする。
+
+- 変更のあったノートだけを再索引（mtime+サイズで判定）
+- 索引は .cache/text_index.json に保存
+
+使い方:
+  python text_index.py 睡眠                   # 日記・読書メモ全体から検索
+  python text_index.py 読み終え --scope diary  # 日記だけ
+  python text_index.py --rebuild              # 索引を作り直す
+"""
+import sys
+import argparse
+from pathlib import Path
+
+from vault_io import file_stamp, load_cache, save_cache
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DIARY_DIR = Path(r"C:\Documents\Obsidian Vault\Main Vault\日記")
+BOOK_DIR = Path(r"C:\Documents\Obsidian Vault\Main Vault\📚_読書メモ")
+
+INDEX_CACHE = "text_index.json"
+INDEX_VERSION = 1
+
+SCOPES = ('diary', 'book')
+
+
+def scope_dirs() -> dict:
+    return {'diary': DIARY_DIR, 'book': BOOK_DIR}
+
+
+def ngrams(text: str) -> set:
+    """索引に載せる語（1文字とbigram、空白を含むものは除く）"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return {g for g in grams if not any(c.isspace() for c in g)}
+
+
+def query_grams(query: str) -> set:
+    """検索語を引くための語（2文字以上ならbigramだけで十分）"""
+    if len(query) >= 2:
+        grams = {query[i:i + 2] for i in range(len(query) - 1)}
+        grams = {g for g in grams if not any(c.isspace() for c in g)}
+        if grams:
+            return grams
+    return {c for c in query if not c.isspace()}
+
+
+class NgramIndex:
+    """文書ID → テキストの転置索引（メモリ上）
+
+    search() はポスティングリストを短い順に積集合し、
+    bigramだけでは確定できない3文字以上の語だけ本文で確認する。
+    """
+
+    def __init__(self):
+        self.postings = {}   # gram -> set(doc_id)
+        self.doc_ids = set()
+        self._doc_grams = None  # doc_id -> grams（削除時にだけ組み立てる）
+
+    def add(self, doc_id: int, text: str):
+        if doc_id in self.doc_ids:
+            self.remove(doc_id)
+        grams = ngrams(text)
+        for g in grams:
+            self.postings.setdefault(g, set()).add(doc_id)
+        self.doc_ids.add(doc_id)
+        if self._doc_grams is not None:
+            self._doc_grams[doc_id] = grams
+
+    def remove(self, doc_id: int):
+        if doc_id not in self.doc_ids:
+            return
+        if self._doc_grams is None:
+            self._doc_grams = {}
+            for g, ids in self.postings.items():
+                for i in ids:
+                    self._doc_grams.setdefault(i, set()).add(g)
+        for g in self._doc_grams.pop(doc_id, ()):
+            ids = self.postings.get(g)
+            if ids is not None:
+                ids.discard(doc_id)
+                if not ids:
+                    del self.postings[g]
+        self.doc_ids.discard(doc_id)
+
+    def candidates(self, query: str) -> set:
+        """検索語のbigramをすべて含む文書（3文字以上では偽陽性を含みうる）"""
+        grams = query_grams(query)
+        if not grams:
+            return set(self.doc_ids)
+        lists = sorted((self.postings.get(g, set()) for g in grams), key=len)
+        result = set(lists[0])
+        for ids in lists[1:]:
+            if not result:
+                break
+            result &= ids
+        return result
+
+    def search(self, query: str, text_of, within=None) -> list[int]:
+        """query を含む文書IDを昇順で返す（text_of(doc_id) で本文を取得して確認）"""
+        found = self.candidates(query)
+        if within is not None:
+            found = {i for i in found if within(i)}
+        if len(query) > 2 or any(c.isspace() for c in query):
+            found = {i for i in found if query in text_of(i)}
+        return sorted(found)
+
+    def to_json(self) -> dict:
+        return {g: sorted(ids) for g, ids in self.postings.items()}
+
+    @classmethod
+    def from_json(cls, postings: dict, doc_ids) -> 'NgramIndex':
+        index = cls()
+        index.postings = {g: set(ids) for g, ids in postings.items()}
+        index.doc_ids = set(doc_ids)
+        return index
+
+
+class VaultTextIndex:
+    """日記・読書メモ全体の永続インデックス"""
+
+    def __init__(self):
+        cache = load_cache(INDEX_CACHE, INDEX_VERSION)
+        # doc_id(str) -> {'scope', 'name', 'stamp'}
+        self.docs = {int(k): v for k, v in cache.get('docs', {}).items()}
+        self.next_id = cache.get('next_id', 0)
+        self.index = NgramIndex.from_json(cache.get('postings', {}), self.docs)
+        self.dirty = False
+
+    def path_of(self, doc_id: int) -> Path:
+        doc = self.docs[doc_id]
+        return scope_dirs()[doc['scope']] / doc['name']
+
+    def text_of(self, doc_id: int) -> str:
+        try:
+            return self.path_of(doc_id).read_text(encoding='utf-8')
+        except OSError:
+            return ''
+
+    def update(self) -> tuple[int, int]:
+        """変更・追加・削除されたノートだけ索引を更新する"""
+        by_key = {(d['scope'], d['name']): i for i, d in self.docs.items()}
+        seen = set()
+        changed = 0
+        for scope, folder in scope_dirs().items():
+            if not folder.exists():
+                continue
+            for f in folder.glob('*.md'):
+                key = (scope, f.name)
+                seen.add(key)
+                stamp = file_stamp(f)
+                doc_id = by_key.get(key)
+                if doc_id is not None and self.docs[doc_id]['stamp'] == stamp:
+                    continue
+                if doc_id is None:
+                    doc_id = self.next_id
+                    self.next_id += 1
+                self.index.add(doc_id, f.read_text(encoding='utf-8'))
+                self.docs[doc_id] = {'scope': scope, 'name': f.name, 'stamp': stamp}
+                changed += 1
+        removed = 0
+        for key, doc_id in by_key.items():
+            if key not in seen:
+                self.index.remove(doc_id)
+                del self.docs[doc_id]
+                removed += 1
+        if changed or removed:
+            self.dirty = True
+        return changed, removed
+
+    def save(self):
+        if not self.dirty:
+            return
+        save_cache(INDEX_CACHE, INDEX_VERSION, {
+            'next_id': self.next_id,
+            'docs': {str(i): d for i, d in self.docs.items()},
+            'postings': self.index.to_json(),
+        })
+        self.dirty = False
+
+    def search(self, query: str, scope: str | None = None) -> list[Path]:
+        """query を含むノートのパス（scope: 'diary' / 'book' / None=全体）"""
+        if scope not in (None, 'all') + SCOPES:
+            raise ValueError(f"unknown scope: {scope}")
+        within = None
+        if scope not in (None, 'all'):
+            within = lambda i: self.docs[i]['scope'] == scope
+        ids = self.index.search(query, self.text_of, within)
+        return sorted(self.path_of(i) for i in ids)
+
+
+_shared = None
+
+
+def open_index() -> VaultTextIndex:
+    """最新状態に更新済みのインデックスを返す（プロセス内で共有）"""
+    global _shared
+    if _shared is None:
+        _shared = VaultTextIndex()
+        _shared.update()
+        _shared.save()
+    return _shared
+
+
+def search(query: str, scope: str | None = None) -> list[Path]:
+    """日記・読書メモから query を含むノートを探す"""
+    return open_index().search(query, scope)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="日記・読書メモの全文検索")
+    parser.add_argument("query", nargs="*", help="検索語（複数指定でAND検索）")
+    parser.add_argument("--scope", choices=('all',) + SCOPES, default='all', help="検索対象")
+    parser.add_argument("--rebuild", action="store_true", help="索引を作り直す")
+    args = parser.parse_args()
+
+    idx = VaultTextIndex()
+    if args.rebuild:
+        idx.docs, idx.next_id, idx.index = {}, 0, NgramIndex()
+    changed, removed = idx.update()
+    idx.save()
+    print(f"🔎 索引: {len(idx.docs)}ノート（更新 {changed} / 削除 {removed}）")
+
+    if not args.query:
+        return
+    hits = None
+    for q in args.query:
+        found = set(idx.search(q, args.scope))
+        hits = found if hits is None else hits & found
+    hits = sorted(hits)
+    print(f"   → 「{' '.join(args.query)}」: {len(hits)}件\n")
+    for path in hits:
+        text = path.read_text(encoding='utf-8')
+        snippet = next((line.strip() for line in text.splitlines() if args.query[0] in line), '')
+        print(f"  {path.stem}: {snippet[:80]}")
+
+
+if __name__ == "__main__":
+    main()
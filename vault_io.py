@@ -0,0 +1,82 @@
+"""
+Vault読み込みの共通ヘルパー
+- ファイルの更新スタンプ（mtime + サイズ）による変更検知
+- スクリプト横の .cache/ に置くJSONキャッシュの読み書き
+- 一時ファイル→renameによる安全な書き込み
+"""
+import json
+import os
+import stat
+import tempfile
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+CACHE_DIR = SCRIPT_DIR / ".cache"
+
+
+def file_stamp(path: Path) -> list[int]:
+    """変更検知用のスタンプ [mtime_ns, size] を返す"""
+    st = path.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_cache(name: str, version: int) -> dict:
+    """キャッシュを読み込む（存在しない・壊れている・バージョン違いなら空）"""
+    path = CACHE_DIR / name
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('version') != version:
+        return {}
+    return data
+
+
+def save_cache(name: str, version: int, data: dict):
+    """キャッシュを書き出す"""
+    CACHE_DIR.mkdir(exist_ok=True)
+    payload = dict(data, version=version)
+    atomic_write_text(CACHE_DIR / name, json.dumps(payload, ensure_ascii=False, separators=(',', ':')))
+
+
+def atomic_write_text(path: Path, text: str, encoding: str = 'utf-8'):
+    """同じディレクトリの一時ファイルに書いてからrenameする（途中で中断しても元ファイルは壊れない）"""
+    atomic_write_bytes(path, [text.encode(encoding)])
+
+
+def atomic_write_bytes(path: Path, chunks):
+    """バイト列の断片を順に一時ファイルへ書いてからrenameする"""
+    path = Path(path)
+    mode = _file_mode(path)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for c in chunks:
+                f.write(c)
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _read_umask() -> int:
+    # umask は読むだけでもいったん書き換えるしかないので、スレッドが動き出す前の import 時に1回だけ読む
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# 新規ファイルのパーミッション（通常の open() で作ったときと同じ 0666 & ~umask）
+NEW_FILE_MODE = 0o666 & ~_read_umask()
+
+
+def _file_mode(path: Path) -> int:
+    """既存ファイルのパーミッション（なければ NEW_FILE_MODE）"""
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except OSError:
+        return NEW_FILE_MODE
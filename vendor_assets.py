@@ -0,0 +1,104 @@
+"""
+📦 グラフライブラリの同梱（docs/vendor/）
+Chart.js と日付アダプターのバージョン固定のビルドを一度だけダウンロードして .cache/vendor/ に置き、
+docs/vendor/ に内容ハッシュ付きのファイル名（chart.1a2b3c4d5e.js）でコピーする。
+
+- ページは同じオリジンから defer で読むので、CDNへの接続待ちで描画が止まらない
+- ダウンロードできない（オフライン・初回で失敗）ときは今までどおりCDNのURLを使う
+- Chart.js の配布物は UMD のバンドルなので、使うコントローラーだけに絞る（tree-shaking）ことはできない。
+  ESM版から絞るにはバンドラーが要るので、ここではビルド済みの .min.js をそのまま使う
+- サイズ（と gzip 後のサイズ）をビルドのログに出す（ライブラリを上げたときの増減が見える）
+"""
+import gzip
+import hashlib
+import re
+import urllib.request
+from pathlib import Path
+
+from template_render import write_if_changed
+from vault_io import CACHE_DIR, atomic_write_bytes
+
+VENDOR_DIRNAME = "vendor"
+HASH_LEN = 10
+
+# (名前, URL) の順に読み込む（アダプターは Chart.js の後）
+ASSETS = (
+    ('chart', 'https://cdn.jsdelivr.net/npm/chart.js@4.4.7/dist/chart.umd.min.js'),
+    ('chartjs-adapter-date-fns', 'https://cdn.jsdelivr.net/npm/chartjs-adapter-date-fns@3.0.0/dist/chartjs-adapter-date-fns.bundle.min.js'),
+)
+
+# name.<hash>.js
+HASHED_RE = re.compile(r'^.+\.[0-9a-f]{%d}\.js$' % HASH_LEN)
+
+
+def _download(url: str) -> bytes | None:
+    """URLの中身（バージョン固定なので .cache/vendor/ にあればそれを使う）。取得できなければ None"""
+    cache_path = CACHE_DIR / VENDOR_DIRNAME / hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]
+    if cache_path.exists():
+        return cache_path.read_bytes()
+    try:
+        req = urllib.request.Request(url, headers={'User-Agent': 'curl/7.68.0'})
+        with urllib.request.urlopen(req, timeout=15) as resp:
+            body = resp.read()
+    except OSError as e:
+        print(f"   ⚠️ ダウンロード失敗（CDNを使います）: {url} — {e}")
+        return None
+    if not body:
+        return None
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_bytes(cache_path, [body])
+    return body
+
+
+def vendor_assets(docs_dir: Path) -> list[dict]:
+    """ライブラリを docs/vendor/ に書く。
+
+    [{'name', 'src', 'size', 'gzip', 'written'}, ...] を ASSETS の順に返す。
+    src は docs からの相対URL（取得できなかったものはCDNのURL、size は None）。
+    """
+    out_dir = Path(docs_dir) / VENDOR_DIRNAME
+    out_dir.mkdir(parents=True, exist_ok=True)
+    results = []
+    for name, url in ASSETS:
+        body = _download(url)
+        if body is None:
+            results.append({'name': name, 'src': url, 'size': None, 'gzip': None, 'written': False})
+            continue
+        path = out_dir / f"{name}.{hashlib.sha256(body).hexdigest()[:HASH_LEN]}.js"
+        results.append({
+            'name': name,
+            'src': f"{VENDOR_DIRNAME}/{path.name}",
+            'size': len(body),
+            'gzip': len(gzip.compress(body, 9, mtime=0)),
+            'written': write_if_changed(path, [body]),
+        })
+    # 使わなくなった古いバージョンを消す
+    keep = {Path(r['src']).name for r in results}
+    for f in out_dir.iterdir():
+        if HASHED_RE.match(f.name) and f.name not in keep:
+            f.unlink()
+    return results
+
+
+def script_tags(srcs) -> str:
+    """defer 付きの <script> タグ（実行順は並び順のまま）"""
+    return '\n'.join(f'<script defer src="{src}"></script>' for src in srcs)
+
+
+def cdn_urls() -> list[str]:
+    return [url for _, url in ASSETS]
+
+
+def size_report(results: list[dict]) -> list[str]:
+    def kb(n):
+        return f"{n / 1024:.1f}KB"
+    lines = []
+    for r in results:
+        if r['size'] is None:
+            lines.append(f"{r['name']}: CDN（{r['src']}）")
+        else:
+            lines.append(f"{r['src']}: {kb(r['size'])}（gzip {kb(r['gzip'])}）")
+    total = [r for r in results if r['size'] is not None]
+    if len(total) > 1:
+        lines.append(f"合計 {kb(sum(r['size'] for r in total))}（gzip {kb(sum(r['gzip'] for r in total))}）")
+    return lines
@@ -31,15 +31,15 @@ def generate_weekly_summary():
     # life_dashboard.pyのextract_all_data()を呼ぶ
     sys.path.insert(0, str(SCRIPT_DIR))
     import life_dashboard as ld
+    import svg_charts
+    from book_table import open_table
 
     data = ld.extract_all_data()
     last_monday, last_sunday = get_week_range()
+    week_start, week_end = last_monday.strftime('%Y-%m-%d'), last_sunday.strftime('%Y-%m-%d')
 
     # 先週のデータをフィルタ
-    week_data = [
-        d for d in data
-        if last_monday.strftime('%Y-%m-%d') <= d['date'] <= last_sunday.strftime('%Y-%m-%d')
-    ]
+    week_data = [d for d in data if week_start <= d['date'] <= week_end]
 
     if not week_data:
         print("⚠️ 先週のデータがありません")
@@ -60,14 +60,19 @@ def generate_weekly_summary():
     step_days = [d for d in week_data if d.get('steps')]
     avg_steps = sum(d['steps'] for d in step_days) / len(step_days) if step_days else 0
     
-    # 読書
-    books_read = set()
-    finished_books = []
-    for d in week_data:
-        for b in d.get('books', []):
-            books_read.add(b['title'])
-            if b.get('finished'):
-                finished_books.append(b['title'])
+    # 読書（本の表から期間で引く）
+    table = open_table()
+    books_read = table.touched_between(week_start, week_end)
+    finished_books = table.finished_between(week_start, week_end)
+
+    # 週のグラフ（月〜日の7本）
+    week = svg_charts.Daily(data).window(last_monday.date(), last_sunday.date())
+    charts = {
+        'hours': svg_charts.bar_strip(week['hours'], width=140, height=40, color=svg_charts.hours_color, hi=10, title='睡眠時間（月〜日）'),
+        'score': svg_charts.sparkline(week['score'], width=140, height=40, color=svg_charts.GREEN, fill=True, title='スコア（月〜日）'),
+        'steps': svg_charts.bar_strip(week['steps'], width=140, height=40, color=svg_charts.CYAN, title='歩数（月〜日）'),
+        'exercise': svg_charts.bar_strip(week['exercise'], width=140, height=12, color=svg_charts.PURPLE, hi=1, title='筋トレ（月〜日）'),
+    }
 
     # 最高/最低の日
     best_day = max(sleep_days, key=lambda d: d.get('score', 0)) if sleep_days else None
@@ -96,6 +101,7 @@ def generate_weekly_summary():
             'books_touched': len(books_read),
             'finished': finished_books,
         },
+        'charts': charts,
     }
 
 
@@ -103,6 +109,7 @@ def format_report(summary):
     """サマリーをObsidianマークダウンに整形"""
     s = summary
     sl = s['sleep']
+    charts = s.get('charts', {})
     
     md = f"""---
 tags: [週次レポート, 自動生成]
@@ -124,14 +131,24 @@ year: {s['year']}
         md += f"| ベスト | {sl['best']['date']} ({sl['best']['hours']}h, スコア{sl['best']['score']}) |\n"
     if sl['worst']:
         md += f"| ワースト | {sl['worst']['date']} ({sl['worst']['hours']}h, スコア{sl['worst']['score']}) |\n"
+    if charts:
+        md += f"\n睡眠時間 {charts['hours']} スコア {charts['score']}\n"
 
     md += f"""
 ## 💪 運動
 - 筋トレ: **{s['exercise']['days']}日** / {s['days']}日
+"""
+    if charts:
+        md += f"\n{charts['exercise']}\n"
 
+    md += f"""
 ## 🚶 歩数
 - 平均: **{s['steps']['avg']:,}歩**（{s['steps']['days_tracked']}日計測）
+"""
+    if charts:
+        md += f"\n{charts['steps']}\n"
 
+    md += f"""
 ## 📚 読書
 - 読んだ本: **{s['reading']['books_touched']}冊**
 """
@@ -0,0 +1,170 @@
+"""
+🗜️ ダッシュボード用データの列形式
+日ごとのレコード（{"date", "hours", "score", ...} のリスト）を、
+キーを毎日くり返さない列形式にエンコードする。
+
+  {
+    "format": "columnar-1",
+    "base": "2026-02-01",          # 最初の日付
+    "day": [0, 1, 2, ...],         # base からの日数
+    "num": {"hours": [7.0, null, ...], "score": [...], ...},
+    "time": {"bedtime": [1410, ...]},   # 0時からの分（"H:MM" も可。時刻でない値はその日だけ "str" へ）
+    "dict": {"weather": {"values": ["晴れ", ...], "idx": [0, -1, ...]}},
+    "str": {"mood": ["...", null, ...]},   # 気分メモはプレビュー（全文は mood_notes の notes シャード）
+    "exercise": {"squat": [10, null, ...], ...},
+    "books": {"titles": ["...", ...], "days": [[0, 3], null, ...]},   # タイトル番号*2 + 読了
+    "extra": [null, {...}, ...]    # 上記以外のキー（あれば）
+  }
+
+- 欠損は null（dict は -1）。decode_rows で元のレコードに戻る（時刻は "HH:MM" で戻るので、
+  レコードの時刻はゼロ埋めしておく: life_dashboard.parse_sleep_details）
+- 本のタイトル表はシャードごとに持つ（新しい本が増えても過去の月のシャードは変わらない）
+- .gz / .br（brotli があれば）の圧縮版も作れる。配信側が対応していれば使える
+"""
+import gzip
+import json
+import re
+from datetime import date, timedelta
+
+try:
+    import brotli
+except ImportError:  # brotli がなければ .br は作らない
+    brotli = None
+
+FORMAT = "columnar-1"
+
+NUM_FIELDS = ('hours', 'score', 'steps', 'deep', 'light', 'rem', 'awake', 'mood_len')
+TIME_FIELDS = ('bedtime', 'waketime')
+DICT_FIELDS = ('weather',)
+STR_FIELDS = ('mood',)
+KNOWN = {'date', 'exercise', 'books', *NUM_FIELDS, *TIME_FIELDS, *DICT_FIELDS, *STR_FIELDS}
+
+TIME_RE = re.compile(r'^\d{1,2}:\d{2}$')
+
+
+def _minutes(v) -> int | None:
+    """"H:MM" / "HH:MM" -> 0時からの分（時刻でなければ None）"""
+    if not (isinstance(v, str) and TIME_RE.match(v)):
+        return None
+    h, m = map(int, v.split(':'))
+    return h * 60 + m
+
+
+def encode_rows(rows: list[dict]) -> dict:
+    """日ごとのレコードを列形式にする（rows は日付順）"""
+    if not rows:
+        return {'format': FORMAT, 'base': None, 'day': []}
+    base = date.fromisoformat(rows[0]['date'])
+    out = {
+        'format': FORMAT,
+        'base': base.isoformat(),
+        'day': [(date.fromisoformat(r['date']) - base).days for r in rows],
+    }
+
+    num = {k: [r.get(k) for r in rows] for k in NUM_FIELDS if any(k in r for r in rows)}
+    if num:
+        out['num'] = num
+
+    time_cols, str_cols = {}, {}
+    for k in TIME_FIELDS:
+        col = [r.get(k) for r in rows]
+        if all(v is None for v in col):
+            continue
+        minutes = [_minutes(v) for v in col]
+        if any(m is not None for m in minutes):
+            time_cols[k] = minutes
+        # 時刻でない値だけ文字列のまま（decode は time のあとに str で上書きする）
+        other = [v if m is None else None for v, m in zip(col, minutes)]
+        if any(v is not None for v in other):
+            str_cols[k] = other
+    if time_cols:
+        out['time'] = time_cols
+
+    dict_cols = {}
+    for k in DICT_FIELDS:
+        col = [r.get(k) for r in rows]
+        if all(v is None for v in col):
+            continue
+        values = list(dict.fromkeys(v for v in col if v is not None))
+        pos = {v: i for i, v in enumerate(values)}
+        dict_cols[k] = {'values': values, 'idx': [-1 if v is None else pos[v] for v in col]}
+    if dict_cols:
+        out['dict'] = dict_cols
+
+    for k in STR_FIELDS:
+        if any(k in r for r in rows):
+            str_cols[k] = [r.get(k) for r in rows]
+    if str_cols:
+        out['str'] = str_cols
+
+    ex_keys = list(dict.fromkeys(k for r in rows for k in (r.get('exercise') or {})))
+    if ex_keys:
+        out['exercise'] = {k: [(r.get('exercise') or {}).get(k) for r in rows] for k in ex_keys}
+
+    if any('books' in r for r in rows):
+        titles = list(dict.fromkeys(b['title'] for r in rows for b in r.get('books', [])))
+        tid = {t: i for i, t in enumerate(titles)}
+        out['books'] = {
+            'titles': titles,
+            'days': [None if 'books' not in r else
+                     [tid[b['title']] * 2 + (1 if b.get('finished') else 0) for b in r['books']]
+                     for r in rows],
+        }
+
+    extra = [{k: v for k, v in r.items() if k not in KNOWN} or None for r in rows]
+    if any(extra):
+        out['extra'] = extra
+    return out
+
+
+def decode_rows(c: dict) -> list[dict]:
+    """encode_rows の逆（テンプレートの decodeRows と同じ）"""
+    if c.get('format') != FORMAT:
+        raise ValueError(f"未対応のデータ形式: {c.get('format')}")
+    if not c['day']:
+        return []
+    base = date.fromisoformat(c['base'])
+    rows = [{'date': (base + timedelta(days=d)).isoformat()} for d in c['day']]
+    for k, col in c.get('num', {}).items():
+        for r, v in zip(rows, col):
+            if v is not None:
+                r[k] = v
+    for k, col in c.get('time', {}).items():
+        for r, v in zip(rows, col):
+            if v is not None:
+                r[k] = f"{v // 60:02d}:{v % 60:02d}"
+    for k, d in c.get('dict', {}).items():
+        for r, i in zip(rows, d['idx']):
+            if i >= 0:
+                r[k] = d['values'][i]
+    for k, col in c.get('str', {}).items():
+        for r, v in zip(rows, col):
+            if v is not None:
+                r[k] = v
+    ex = c.get('exercise', {})
+    for i, r in enumerate(rows):
+        e = {k: col[i] for k, col in ex.items() if col[i] is not None}
+        if e:
+            r['exercise'] = e
+    books = c.get('books')
+    if books:
+        for r, refs in zip(rows, books['days']):
+            if refs is not None:
+                r['books'] = [{'title': books['titles'][x >> 1], 'finished': bool(x & 1)} for x in refs]
+    for r, e in zip(rows, c.get('extra', [])):
+        if e:
+            r.update(e)
+    return rows
+
+
+def dumps(obj) -> str:
+    """区切りの空白を省いたJSON"""
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def compressed_variants(payload: bytes) -> dict[str, bytes]:
+    """{'.gz': ..., '.br': ...}（brotli がなければ .gz だけ）"""
+    out = {'.gz': gzip.compress(payload, 9, mtime=0)}
+    if brotli is not None:
+        out['.br'] = brotli.compress(payload, quality=11)
+    return out
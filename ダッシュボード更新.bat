@@ -23,10 +23,8 @@ if errorlevel 1 (
 
 echo.
 echo [3/3] 🚀 GitHubにデプロイ中...
-cd /d "%PROJ_DIR%"
-git add docs\
-git commit -m "update %date% %time:~0,5%" 2>nul
-git push origin master
+rem docs\ の変わったファイルだけをコミットして push する（変更がなければ何もしない）
+python "%PROJ_DIR%\git_deploy.py"
 if errorlevel 1 (
     echo ❌ デプロイに失敗しました
     pause